@@ -0,0 +1,47 @@
+""" stream csv or json lines through a criteria, python -m beval "expr" [--format csv|jsonl] [--input path] [--output path] """
+import sys
+import argparse
+from beval.criteria import Const, to_criteria, csv_value
+
+
+def open_stream(path, mode, default):
+    if path is None or path == "-":
+        return default
+
+    return open(path, mode, newline="") if sys.version_info[0] >= 3 else open(path, mode + "b")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m beval", description="write the records matched by a criteria")
+    parser.add_argument("expr", help="bool expression of the criteria")
+    parser.add_argument("--format", choices=(Const.csv, Const.jsonl,), default=Const.csv, help="format of input and output")
+    parser.add_argument("--input", default=None, help="path of the input, stdin by default")
+    parser.add_argument("--output", default=None, help="path of the output, stdout by default")
+    parser.add_argument("--fuzzy", action="store_true", help="evaluate in fuzzy mode")
+    parser.add_argument("--on-error", choices=(Const.exclude, Const.include, Const.raise_,), default=Const.exclude,
+                        help="what to do with records evaluated to UNKNOWN or ERROR")
+    parser.add_argument("--buffersize", type=int, default=1 << 20, help="bytes read from the input per call")
+    parser.add_argument("--chunksize", type=int, default=1024, help="csv rows evaluated per chunk")
+    parser.add_argument("--strings", action="store_true", help="compare csv values as strings rather than numbers")
+    options = parser.parse_args(argv)
+
+    criteria = to_criteria(options.expr)
+    (source, sink) = (open_stream(options.input, "r", sys.stdin), open_stream(options.output, "w", sys.stdout))
+
+    try:
+        if options.format == Const.csv:
+            criteria.filter_csv(source, sink, options.fuzzy, options.on_error, None if options.strings else csv_value,
+                                options.buffersize, options.chunksize)
+
+        else:
+            criteria.filter_jsonl(source, sink, options.fuzzy, options.on_error, buffersize=options.buffersize)
+
+    finally:
+        sink.flush()
+        for stream in (source, sink,):
+            if stream not in (sys.stdin, sys.stdout,):
+                stream.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+""" binary encoding of criteria, a header of magic and format version followed by marshaled nested tuples of
+    (tag, args...) per node, builtin values as is, anything else in a pickled table referred to by (position,) """
+
+import sys
+import struct
+import pickle
+import marshal
+import operator
+from beval.criteria import Const, criteria_class, hashable_types
+
+
+codec_magic = b"bEv"
+
+
+intern_ = getattr(sys, "intern", None) or intern
+
+
+codec_version = 1
+
+
+codec_tags = (Const.Bool, Const.Eq, Const.NotEq, Const.Lt, Const.LtE, Const.Gt, Const.GtE, Const.Between, Const.In,
+              Const.NotIn, Const.All, Const.Any, Const.And, Const.Or, Const.Not, Const.Compiled, Const.Adaptive,)
+
+
+codec_ops = (operator.eq, operator.ne, operator.lt, operator.le, operator.gt, operator.ge,)
+
+
+class Encoder(object):
+
+    def __init__(self):
+        self._tags = dict((criteria_class.lookup(name), tag) for (tag, name) in enumerate(codec_tags))
+        self._ops = dict((op, position) for (position, op) in enumerate(codec_ops))
+        self._extras = list()
+
+    def extra(self, obj):
+        self._extras.append(obj)
+        return len(self._extras) - 1,
+
+    def value(self, obj):
+        if type(obj) is str:
+            return intern_(obj)
+
+        return obj if type(obj) in hashable_types else self.extra(obj)
+
+    def op(self, op):
+        position = self._ops.get(op, None)
+        return self.extra(op) if position is None else position
+
+    def node(self, criteria):
+        tag = self._tags.get(type(criteria), None)
+        if tag is None:
+            return (-1,) + self.extra(criteria)
+
+        name = codec_tags[tag]
+        if name in (Const.All, Const.Any, Const.And, Const.Or,):
+            args = tuple(self.node(one) for one in criteria.many)
+
+        elif name == Const.Not:
+            args = (self.node(criteria.one),)
+
+        elif name == Const.Compiled:
+            args = (self.node(criteria.criteria),)
+
+        elif name == Const.Adaptive:
+            args = (self.node(criteria.criteria), criteria._period, criteria._any_order)
+
+        elif name == Const.Between:
+            args = (self.value(criteria.lower), self.value(criteria.key), self.value(criteria.upper), self.op(criteria.lower_op),
+                    self.op(criteria.upper_op))
+
+        elif name in (Const.In, Const.NotIn,):
+            args = (self.value(criteria.key),) + tuple(self.value(one) for one in criteria.right)
+
+        elif name == Const.Eq:
+            args = (self.value(criteria.key), self.value(criteria.right), self.op(criteria.op))
+
+        elif name == Const.Bool:
+            args = (self.value(criteria.key),)
+
+        else:
+            args = (self.value(criteria.key), self.value(criteria.right))
+
+        return (tag,) + args
+
+    def encode(self, obj):
+        many = isinstance(obj, (list, tuple))
+        body = tuple(self.node(one) for one in obj) if many else self.node(obj)
+        extras = pickle.dumps(self._extras, 2) if self._extras else None
+        return codec_magic + struct.pack("<B", codec_version) + marshal.dumps((many, body, extras))
+
+
+class Decoder(object):
+
+    def __init__(self, extras):
+        self._extras = extras
+        readers = {Const.Adaptive: self.adaptive, Const.Between: self.between, Const.In: self.in_, Const.NotIn: self.in_,
+                   Const.Eq: self.eq, Const.Bool: self.bool}
+        readers.update(dict.fromkeys((Const.All, Const.Any, Const.And, Const.Or, Const.Not, Const.Compiled,), self.many))
+        self._readers = [(criteria_class.lookup(name), readers.get(name, self.leaf)) for name in codec_tags]
+
+    def node(self, obj):
+        if obj[0] < 0:
+            return self._extras[obj[1]]
+
+        (cls, reader) = self._readers[obj[0]]
+        return reader(cls, obj)
+
+    def value(self, obj):
+        return self._extras[obj[0]] if type(obj) is tuple else obj
+
+    def op(self, op):
+        return self._extras[op[0]] if type(op) is tuple else codec_ops[op]
+
+    def many(self, cls, obj):
+        node = self.node
+        return cls(*[node(one) for one in obj[1:]])
+
+    def adaptive(self, cls, obj):
+        return cls(self.node(obj[1]), obj[2], obj[3])
+
+    def between(self, cls, obj):
+        return cls(self.value(obj[1]), self.value(obj[2]), self.value(obj[3]), self.op(obj[4]), self.op(obj[5]))
+
+    def in_(self, cls, obj):
+        (extras, tuple_) = (self._extras, tuple)
+        return cls(*[extras[one[0]] if type(one) is tuple_ else one for one in obj[1:]])
+
+    def eq(self, cls, obj):
+        return cls(self.value(obj[1]), self.value(obj[2]), self.op(obj[3]))
+
+    def bool(self, cls, obj):
+        return cls(self.value(obj[1]))
+
+    def leaf(self, cls, obj):
+        return cls(self.value(obj[1]), self.value(obj[2]))
+
+
+def to_bytes(obj):
+    """ versioned binary encoding of a criteria, or of a list of them, values and operators which are not builtin
+        are pickled, so the encoding must only be loaded from a trusted source as pickle is """
+    return Encoder().encode(obj)
+
+
+def from_bytes(data):
+    """ criteria, or list of them, decoded from to_bytes. Values and operators which are not builtin are unpickled,
+        which can run arbitrary code, so never decode data from an untrusted source """
+    header = len(codec_magic) + 1
+    if data[:len(codec_magic)] != codec_magic:
+        raise ValueError("not a criteria encoding")
+
+    version = struct.unpack("<B", data[len(codec_magic):header])[0]
+    if version != codec_version:
+        raise ValueError("unsupported criteria encoding version %s" % version)
+
+    (many, body, extras) = marshal.loads(data[header:])
+    decoder = Decoder(pickle.loads(extras) if extras is not None else [])
+    return [decoder.node(one) for one in body] if many else decoder.node(body)
@@ -1,8 +1,18 @@
 import ast
+import sys
+import bisect
+import timeit
 import numbers
 import operator
+import threading
 import collections
 
+try:
+    import numpy
+
+except ImportError:
+    numpy = None
+
 
 class Const(object):
 
@@ -25,8 +35,13 @@ class Const(object):
     Any = "Any"
     Not = "Not"
     Ctx = "Ctx"
+    RowCtx = "RowCtx"
+    Evaluator = "Evaluator"
     Visitor = "Visitor"
     Universal = "Universal"
+    Compiled = "Compiled"
+    Adaptive = "Adaptive"
+    Projection = "Projection"
 
     True_ = "True"
     False_ = "False"
@@ -35,6 +50,16 @@ class Const(object):
     fuzzy = "fuzzy"
     default = "default"
 
+    debug = "debug"
+    production = "production"
+
+    exclude = "exclude"
+    include = "include"
+    raise_ = "raise"
+
+    csv = "csv"
+    jsonl = "jsonl"
+
     getitem = "__getitem__"
     eval_ = "eval"
 
@@ -60,8 +85,16 @@ class Const(object):
     kwargs = "kwargs"
 
 
-def to_criteria(expr):
-    return criteria_class.instance(Const.Visitor, expr).go()
+def to_criteria(expr, compiled=False):
+    key = (expr, compiled)
+    criteria = parse_cache.get(key)
+
+    if criteria is None:
+        criteria = criteria_class.instance(Const.Visitor, expr).go()
+        criteria = criteria.compile() if compiled else criteria
+        parse_cache.put(key, criteria)
+
+    return criteria
 
 
 def safe_monad(func, *args, **kwargs):
@@ -79,12 +112,470 @@ def quote(obj):
     return ("'%s'" if isinstance(obj, str) else "%s") % obj
 
 
-def access(ctx, key):
-    return ctx[key]
+missing = object()
+
+
+literals = dict()
+
+
+def literal_of(key):
+    """ literal value of key, memoized, or missing when key is not a literal """
+    if type(key) is str:
+        obj = literals.get(key, literals)
+        if obj is not literals:
+            return obj
+
+    elif isinstance(key, bool) or isinstance(key, numbers.Number):
+        return key
+
+    (obj, err) = safe_monad(literals.get, key, literals)
+    if err is not None:
+        return missing
+
+    elif obj is literals:
+        (obj, err) = safe_monad(ast.literal_eval, key)
+        obj = obj if err is None else missing
+
+        if len(literals) < 65536:
+            literals[key] = obj
+
+    return obj
+
+
+error_messages = dict()
+
+
+def key_error(key):
+    """ new KeyError for key not found, returned rather than raised, only its message is memoized per key. Instances
+        are never shared, as one raised by the caller would keep its traceback and the frames it references """
+    message = error_messages.get((KeyError, key), None)
+
+    if message is None:
+        message = "cannot find key '%s'" % key
+        if len(error_messages) < 65536:
+            error_messages[(KeyError, key)] = message
+
+    return KeyError(message)
+
+
+ordering_ops = frozenset([operator.lt, operator.le, operator.gt, operator.ge])
+
+
+orderable_types = {bool: int, int: int, float: int, str: str, bytes: bytes, type(None): type(None)} \
+    if sys.version_info[0] >= 3 else dict()
+
+
+def incompatible(op, left, right):
+    """ new TypeError when builtin left and right cannot be ordered, None otherwise, its message is memoized """
+    if op not in ordering_ops or not orderable_types:
+        return None
+
+    (left_type, right_type) = (type(left), type(right))
+    (left_family, right_family) = (orderable_types.get(left_type, None), orderable_types.get(right_type, None))
+    if left_family is None or right_family is None or left_family is right_family:
+        return None
+
+    message = error_messages.get((op, left_type, right_type), None)
+    if message is None:
+        message = error_messages[(op, left_type, right_type)] = "'%s' not supported between instances of '%s' and '%s'" % \
+            (operator_ser_symbol.lookup(op), left_type.__name__, right_type.__name__)
+
+    return TypeError(message)
+
+
+def class_attribute(cls, key):
+    """ attribute as defined on the class or its bases, without triggering descriptors """
+    for base in getattr(cls, "__mro__", ()):
+        if key in vars(base):
+            return vars(base)[key]
+
+    return missing
+
+
+def resolve_accessor(ctx, one, key):
+    return ctx._resolve(key)
+
+
+def dict_accessor(ctx, one, key):
+    obj = one.get(key, missing)
+    return ctx._resolve(key) if obj is missing else obj
+
+
+def item_accessor(ctx, one, key):
+    return one[key] if key in one else ctx._resolve(key)
+
+
+def attribute_accessor(ctx, one, key):
+    obj = getattr(one, key, missing)
+
+    if obj is missing:
+        return ctx._resolve(key)
+
+    else:
+        return obj() if callable(obj) else obj
+
+
+def property_accessor(fget):
+    def accessor(ctx, one, key):
+        try:
+            obj = fget(one)
+
+        except AttributeError:
+            return ctx._resolve(key)
+
+        return obj() if callable(obj) else obj
+
+    return accessor
+
+
+def accessor_of(cls, key, one):
+    """ accessor strategy for all objs of the same cls, each strategy falls back to the full resolution on miss """
+    if cls is not getattr(one, "__class__", None):
+        return resolve_accessor
+
+    elif cls is dict:
+        return dict_accessor
+
+    elif hasattr(cls, Const.getitem):
+        return item_accessor
+
+    elif not isinstance(key, str):
+        return resolve_accessor
+
+    obj = class_attribute(cls, key)
+    if isinstance(obj, property) and obj.fget:
+        return property_accessor(obj.fget)
+
+    else:
+        return attribute_accessor
+
+
+def matches(func, iterable, fuzzy, on_error, ctx=None):
+    """ yield (obj, matched) evaluating compiled func against each obj with one reused ctx """
+    ctx = criteria_class.instance(Const.Ctx, None, fuzzy) if ctx is None else ctx
+
+    for obj in iterable:
+        (ans, err) = func(ctx.rebind(obj), fuzzy)
+
+        if ans in (True, False,):
+            yield obj, ans in (True,)
+
+        elif on_error == Const.exclude:
+            yield obj, False
+
+        elif on_error == Const.include:
+            yield obj, True
+
+        else:
+            raise err if err is not None else ValueError("%s evaluating %s" % (ans, obj))
+
+
+number_chars = frozenset("0123456789+-.")
+
+
+float_chars = frozenset("0123456789+-.eE")
+
+
+def csv_value(text):
+    """ int or float when the csv text is written as one, the text otherwise. Text an int does not write back the
+        same, such as the zip code 02134 or +1, and floats with leading zeros or spelled as inf or nan stay text """
+    if text[:1] not in number_chars:
+        return text
+
+    (obj, err) = safe_monad(int, text)
+    if err is None:
+        return obj if str(obj) == text else text
+
+    digits = text.lstrip("+-")
+    if not all(char in float_chars for char in text) or (digits[:1] == "0" and digits[1:2].isdigit()):
+        return text
+
+    (obj, err) = safe_monad(float, text)
+    return obj if err is None else text
+
+
+def negate(func):
+    def negated(ctx, fuzzy):
+        (obj, err) = func(ctx, fuzzy)
+        return not obj if obj in (True, False,) else obj, err
+
+    return negated
+
+
+try:
+    hashable_types = frozenset([str, unicode, bool, int, long, float, type(None)])
+    number_types = frozenset([int, long, float])
+    text_kinds = {"S": frozenset([str]), "U": frozenset([str, unicode])}
+
+except NameError:
+    hashable_types = frozenset([str, bytes, bool, int, float, type(None)])
+    number_types = frozenset([int, float])
+    text_kinds = {"S": frozenset([bytes]), "U": frozenset([str])}
+
+
+def value_key(obj):
+    """ structural key of a compared value, builtin values keyed by type and value, unhashable ones by identity """
+    if isinstance(obj, Universal):
+        return Universal,
+
+    elif type(obj) in hashable_types:
+        return type(obj), obj if obj == obj else repr(obj)
+
+    try:
+        hash(obj)
+        return type(obj), obj
+
+    except TypeError:
+        return type(obj), id(obj)
+
+
+def in_values(criteria):
+    if type(criteria) is Eq and criteria.op is operator.eq:
+        return criteria.right,
+
+    elif type(criteria) is In:
+        return criteria.right
+
+
+def merge_in(many):
+    """ adjacent Eq/In on one key become one In, which compares the same values in the same order """
+    merged = list()
+    for one in many:
+        (last, values) = (merged[-1] if merged else None, in_values(one))
+
+        if values is not None and in_values(last) is not None and type(last.key) is type(one.key) and last.key == one.key:
+            (keys, right) = (set(), list())
+            for value in in_values(last) + values:
+                if value_key(value) not in keys:
+                    keys.add(value_key(value))
+                    right.append(value)
+
+            merged[-1] = criteria_class.instance(Const.In, one.key, *right)
+
+        else:
+            merged.append(one)
+
+    return merged
+
+
+def optimize_many(criteria, kinds, stop):
+    """ children of All (stop False) or Any (stop True) optimized, flattened and deduplicated """
+    if type(criteria) not in kinds or not criteria.many:
+        return criteria
+
+    (many, seen) = (list(), set())
+    for one in criteria.many:
+        one = one.optimize()
+
+        for one_ in (one.many if type(one) in kinds and one.many else (one,)):
+            if one_ not in seen:
+                seen.add(one_)
+                many.append(one_)
+
+    if stop:
+        many = merge_in(many)
+
+    if len(many) == 1:
+        return many[0]
+
+    elif len(many) == len(criteria.many) and all(one is one_ for (one, one_) in zip(many, criteria.many)):
+        return criteria
+
+    return criteria_class.instance(Const.Any if stop else Const.All, *many)
+
+
+def adaptive_many(many, stop, period, any_order, sample=8):
+    """ All (stop False) or Any (stop True) over compiled children, which every period evaluations are ordered by
+        seconds per call over the rate of deciding the outcome, the time is measured once every sample evaluations """
+    size = len(many)
+    (calls, stops, timings, costs) = ([0] * size, [0] * size, [0] * size, [0.0] * size)
+    (declared, state) = (tuple(range(size)), [tuple(range(size)), 0])
+    (timer, passed_ans) = (timeit.default_timer, not stop)
+
+    def rank(i):
+        if not calls[i] or not timings[i]:
+            return 0.0
+
+        rate = float(stops[i]) / calls[i]
+        return costs[i] / timings[i] / rate if rate else float("inf")
+
+    def fn(ctx, fuzzy):
+        state[1] += 1
+        if state[1] % period == 0:
+            state[0] = tuple(sorted(range(size), key=rank))
+
+        (passed, first_error, timed) = (0, None, state[1] % sample == 0)
+        for i in (state[0] if any_order else declared):
+            if timed:
+                started = timer()
+                (obj, err) = many[i](ctx, fuzzy)
+                (timings[i], costs[i]) = (timings[i] + 1, costs[i] + timer() - started)
+
+            else:
+                (obj, err) = many[i](ctx, fuzzy)
+
+            calls[i] += 1
+            if obj in (True, False,):
+                if (obj in (True,)) is stop:
+                    stops[i] += 1
+                    return obj, first_error or err
+
+                passed += 1
+                first_error = first_error or err
+
+            elif fuzzy:
+                first_error = first_error or err
+
+            else:
+                return Const.ERROR, first_error or err
+
+        if passed > 0:
+            return passed_ans, first_error
+
+        else:
+            return Const.UNKNOWN if fuzzy else Const.ERROR, first_error
+
+    return fn
+
+
+def adaptive_compile(criteria, period, any_order):
+    """ func of criteria reordering the children of All/Any, without any_order they keep their order and
+        criteria compiles as is, without counting nor timing them """
+    cls = type(criteria)
+    if cls in (Compiled, Adaptive):
+        return adaptive_compile(criteria.criteria, period, any_order)
+
+    elif not any_order:
+        return criteria._compile()
+
+    elif cls in (All, And, Any, Or) and criteria.many:
+        many = tuple(adaptive_compile(one, period, any_order) for one in criteria.many)
+        return adaptive_many(many, cls in (Any, Or), period, any_order)
+
+    elif cls is Not:
+        return negate(adaptive_compile(criteria.one, period, any_order))
+
+    return criteria._compile()
+
+
+Masks = collections.namedtuple("Masks", ["true", "false", "unknown", "error"])
+
+
+def columns_size(columns):
+    if hasattr(columns, "shape"):
+        return columns.shape[0]
+
+    for key in columns:
+        return len(columns[key])
+
+    return 0
+
+
+def masks_of(ans, bad, fuzzy):
+    (ok, none) = (~bad, numpy.zeros(bad.shape, dtype=bool))
+    return Masks(ok & ans, ok & ~ans, bad if fuzzy else none, none if fuzzy else bad)
+
+
+def outcomes_to_arrays(outcomes):
+    """ (ans, bad) bool arrays out of a list of row outcomes """
+    ans = numpy.array([obj in (True,) for obj in outcomes], dtype=bool)
+    bad = numpy.array([obj in (Const.UNKNOWN, Const.ERROR,) for obj in outcomes], dtype=bool)
+    return ans, bad
+
+
+def elementwise(obj, values):
+    if isinstance(obj, numpy.ndarray) and obj.dtype == bool and obj.shape == values.shape:
+        return obj
+
+    else:
+        raise TypeError("elementwise comparison is not supported for %s" % values.dtype)
+
+
+def comparable(values, *rights):
+    """ True when numpy compares values with each of rights elementwise as python compares each value, numbers with
+        numbers, text with text of the same kind and objects with anything, except values of registered extenders """
+    (kind, find) = (values.dtype.kind, SyntaxAstCallExtender.find_comparator)
+    if any(find(type(one)) for one in rights):
+        return False
+
+    elif kind in "biufc":
+        return all(type(one) in number_types or type(one) is bool for one in rights)
+
+    elif kind in text_kinds:
+        return all(type(one) in text_kinds[kind] for one in rights)
+
+    return kind == "O" and not (SyntaxAstCallExtender.comparators and any(find(type(one)) for one in values))
+
+
+def vectorize_leaf(criteria, columns, size, fuzzy):
+    """ vectorized (ans, bad) of a leaf criteria, falls back to row by row evaluation of the column when
+        _vectorize_values returns None or numpy fails """
+    key = criteria.key
+    if not specializes(criteria):
+        return Criteria._vectorize(criteria, columns, size, fuzzy)
+
+    elif key not in columns:
+        (obj, _) = criteria._compile()(criteria_class.instance(Const.Ctx, dict(), fuzzy), fuzzy)
+        return outcomes_to_arrays([obj] * size)
+
+    values = numpy.asarray(columns[key])
+    (ans, err) = safe_monad(criteria._vectorize_values, values)
+    if err is None and ans is not None:
+        return ans, numpy.zeros(size, dtype=bool)
+
+    func = criteria._compile()
+    return outcomes_to_arrays(
+        [func(criteria_class.instance(Const.Ctx, {key: value}, fuzzy), fuzzy)[0] for value in values.tolist()])
+
+
+def owner_of(cls, name):
+    """ class of the mro of cls defining name """
+    for base in cls.__mro__:
+        if name in vars(base):
+            return base
+
+
+""" methods the compiled closures stand in for, a subclass overriding any of them is compiled as evaluating """
+compiled_names = ("eval", "compare", "_access", "fuzzy",)
+
+
+specialized = dict()
+
+
+def specializes(criteria):
+    """ True when the _compile of the class of criteria holds for its eval, False when a subclass, for instance one
+        swapped in through criteria_class.override, overrides eval or what eval relies on below that _compile """
+    cls = type(criteria)
+    obj = specialized.get(cls, None)
+
+    if obj is None:
+        owner = owner_of(cls, "_compile")
+        obj = specialized[cls] = all(issubclass(owner, owner_of(cls, name)) for name in compiled_names)
+
+    return obj
+
+
+custom_compares = dict()
+
+
+def custom_compare(criteria):
+    """ True when the class of criteria overrides compare, which is then called for every comparison """
+    cls = type(criteria)
+    obj = custom_compares.get(cls, None)
+
+    if obj is None:
+        obj = custom_compares[cls] = owner_of(cls, "compare") is not Criteria
+
+    return obj
+
+
+def leaf_keys(criteria):
+    """ key read by a leaf criteria, a literal key is looked up too and only falls back to its literal value """
+    return frozenset([criteria._key])
 
 
 def types_supported_as_key(criteria, key):
-    if isinstance(key, str) or isinstance(key, bool) or isinstance(key, numbers.Number):
+    if type(key) is str or isinstance(key, str) or isinstance(key, bool) or isinstance(key, numbers.Number):
         return key
 
     else:
@@ -110,8 +601,24 @@ def assert_outcomes_d_w_a(std_types, fuzzy_types):
     return assert_outcomes_d
 
 
+custom_getitems = dict()
+
+
+def custom_getitem(ctx):
+    """ True when the class of ctx overrides the __getitem__ of AbstractCtx and Ctx """
+    cls = type(ctx)
+    obj = custom_getitems.get(cls, None)
+
+    if obj is None:
+        obj = custom_getitems[cls] = owner_of(cls, "__getitem__") not in (AbstractCtx, Ctx)
+
+    return obj
+
+
 class AbstractCtx(object):
 
+    __slots__ = ()
+
     def get(self, key, *args, **kwargs):
         try:
             return self.__getitem__(key, *args, **kwargs)
@@ -128,21 +635,31 @@ class AbstractCtx(object):
         if err is None:
             return obj
 
-        if isinstance(key, bool) or isinstance(key, numbers.Number):
-            return key
-
-        (obj, err) = safe_monad(ast.literal_eval, key)
-        if err is None:
+        obj = literal_of(key)
+        if obj is not missing:
             return obj
 
         raise KeyError("cannot find key '%s'" % key)
 
+    def lookup(self, key):
+        """ value of key, or missing rather than raising when key cannot be found. A subclass overriding __getitem__
+            is looked up through it, as leaves did with ctx[key] """
+        (obj, err) = safe_monad(self.__getitem__ if custom_getitem(self) else self.key, key)
+        return obj if err is None else literal_of(key)
+
     def key(self, key, *args, **kwargs):
         raise NotImplementedError
 
+    def rebind(self, one):
+        raise NotImplementedError
+
 
 class Ctx(AbstractCtx):
 
+    __slots__ = ("_one", "_fuzzy",)
+
+    accessors = dict()
+
     @property
     def one(self):
         return self._one
@@ -155,7 +672,58 @@ class Ctx(AbstractCtx):
         self._one = one
         self._fuzzy = fuzzy
 
+    def rebind(self, one):
+        self._one = one
+        return self
+
+    def __getitem__(self, key, *args, **kwargs):
+        obj = self._lookup(key)
+
+        if obj is missing:
+            raise KeyError("cannot find key '%s'" % key)
+
+        return obj
+
     def key(self, key, *args, **kwargs):
+        obj = self._find(key)
+
+        if obj is missing:
+            raise KeyError("cannot find key '%s'" % key)
+
+        return obj
+
+    def lookup(self, key):
+        if type(self) is not Ctx and custom_getitem(self):
+            return super(Ctx, self).lookup(key)
+
+        return self._lookup(key)
+
+    def _lookup(self, key):
+        """ lookup through key, the accessor strategies unless a subclass overrides key """
+        if type(self) is not Ctx and type(self).key != Ctx.key:
+            (obj, err) = safe_monad(self.key, key)
+            return obj if err is None else literal_of(key)
+
+        try:
+            obj = self._find(key)
+
+        except Exception:
+            obj = missing
+
+        return literal_of(key) if obj is missing else obj
+
+    def _find(self, key):
+        (one, accessors) = (self._one, Ctx.accessors)
+        accessor = accessors.get((type(one), key), None)
+
+        if accessor is None:
+            accessor = accessor_of(type(one), key, one)
+            if len(accessors) < 65536:
+                accessors[(type(one), key)] = accessor
+
+        return accessor(self, one, key)
+
+    def _resolve(self, key):
         if hasattr(self._one, Const.getitem) and key in self._one:
             return self._one[key]
 
@@ -168,57 +736,336 @@ class Ctx(AbstractCtx):
             return obj() if callable(obj) else obj
 
         else:
-            raise KeyError("cannot find key '%s'" % key)
-
-
-class Criteria(object):
+            return missing
 
-    @assert_outcomes_d_w_a([True, False, Const.ERROR], [True, False, Const.UNKNOWN])
-    def __call__(self, obj, fuzzy=False):
-        ctx = obj if isinstance(obj, Ctx) else criteria_class.instance(Const.Ctx, obj, fuzzy)
-        return self.eval(ctx)
 
-    def compare(self, ctx, key, op, left, right):
-        func = SyntaxAstCallExtender.find_comparator(type(right))
-        return safe_monad(func, ctx, key, op, left, right) if func else safe_monad(op, left, right)
+class RowCtx(AbstractCtx):
+    """ ctx of rows whose values are in the order of a header, such as csv rows or db cursor tuples. The position of
+        each key is resolved once when binding the header, optionally only for the keys a criteria requires, and
+        the ctx is rebound from row to row without allocation. Values are passed through convert when given """
 
-    def eval(self, ctx):
-        raise NotImplementedError
+    __slots__ = ("_one", "_fuzzy", "_header", "_positions", "_convert",)
 
-    def fuzzy(self, ctx):
-        return ctx.fuzzy if getattr(ctx, 'fuzzy') else False
+    @property
+    def one(self):
+        return self._one
 
-    def __init__(self, stack=True):
-        self._stack = list() if stack else None
+    @property
+    def fuzzy(self):
+        return self._fuzzy
 
-    def size(self):
-        return len(self._stack)
+    @property
+    def header(self):
+        return self._header
 
-    def _push(self, item):
-        self._stack.append(item)
+    def __init__(self, header, keys=None, fuzzy=False, convert=None):
+        self._one = ()
+        self._fuzzy = fuzzy
+        self._convert = convert
+        self.bind(header, keys)
 
-    def _pop(self):
-        return self._stack.pop()
+    def bind(self, header, keys=None):
+        """ resolve the positions of keys in header, all of them by default, the first column of a name wins """
+        positions = dict()
+        for (position, key) in enumerate(header):
+            if keys is None or key in keys:
+                positions.setdefault(key, position)
 
-    def Bool(self, key):
-        c = criteria_class.instance(Const.Bool, key)
-        self._push(c)
+        (self._header, self._positions) = (tuple(header), positions)
         return self
 
-    def Eq(self, key, right):
-        c = criteria_class.instance(Const.Eq, key, right)
-        self._push(c)
+    def rebind(self, one):
+        self._one = one
         return self
 
-    def NotEq(self, key, right):
-        c = criteria_class.instance(Const.NotEq, key, right)
-        self._push(c)
-        return self
+    def key(self, key, *args, **kwargs):
+        obj = self._find(key)
 
-    def LtE(self, key, right):
-        c = criteria_class.instance(Const.LtE, key, right)
-        self._push(c)
-        return self
+        if obj is missing:
+            raise KeyError("cannot find key '%s'" % key)
+
+        return obj
+
+    def lookup(self, key):
+        if type(self) is not RowCtx and custom_getitem(self):
+            return super(RowCtx, self).lookup(key)
+
+        obj = self._find(key)
+        return literal_of(key) if obj is missing else obj
+
+    def _find(self, key):
+        position = self._positions.get(key, None)
+        if position is None or position >= len(self._one):
+            return missing
+
+        obj = self._one[position]
+        if self._convert is None:
+            return obj
+
+        (obj, err) = safe_monad(self._convert, obj)
+        return obj if err is None else missing
+
+
+def ctx_of(obj, fuzzy=False):
+    """ obj when it is a ctx already, a new ctx wrapping obj otherwise """
+    return obj if isinstance(obj, AbstractCtx) else criteria_class.instance(Const.Ctx, obj, fuzzy)
+
+
+class Evaluator(object):
+    """ evaluates objs one after another against a compiled criteria, rebinding one ctx per obj with fuzzy resolved
+        once for the run, so nothing is allocated per obj but the outcome. fuzzy is the one of ctx when given """
+
+    __slots__ = ("_criteria", "_func", "_ctx", "_fuzzy",)
+
+    @property
+    def criteria(self):
+        return self._criteria
+
+    @property
+    def ctx(self):
+        return self._ctx
+
+    @property
+    def fuzzy(self):
+        return self._fuzzy
+
+    def __init__(self, criteria, fuzzy=False, ctx=None):
+        self._criteria = criteria
+        self._func = criteria._compile()
+        self._ctx = criteria_class.instance(Const.Ctx, None, fuzzy) if ctx is None else ctx
+        self._fuzzy = bool(self._ctx.fuzzy)
+
+    def __call__(self, obj):
+        return self._func(self._ctx.rebind(obj), self._fuzzy)
+
+
+def call(criteria, obj, fuzzy=False):
+    return criteria.eval(ctx_of(obj, fuzzy))
+
+
+checked_call = assert_outcomes_d_w_a([True, False, Const.ERROR], [True, False, Const.UNKNOWN])(call)
+
+
+production = False
+
+
+def set_mode(mode):
+    """ debug asserts the outcome of every criteria called, production skips it and evaluates children directly """
+    global production
+
+    if mode not in (Const.debug, Const.production,):
+        raise ValueError("%s is not supported" % mode)
+
+    production = mode == Const.production
+    Criteria.__call__ = call if production else checked_call
+
+
+def get_mode():
+    return Const.production if production else Const.debug
+
+
+class Criteria(object):
+
+    __slots__ = ("_hash",)
+
+    __call__ = checked_call
+
+    def __new__(cls, *args, **kwargs):
+        return super(Criteria, cls).__new__(Builder if cls is Criteria else cls)
+
+    def _access(self, ctx):
+        """ value of the leaf key, looked up in ctx first and falling back to the literal value of the key """
+        obj = ctx.lookup(self._key)
+        return (obj, None) if obj is not missing else (None, key_error(self._key))
+
+    def compare(self, ctx, key, op, left, right):
+        """ op(left, right), or the compare of the extender registered for the type of right """
+        func = SyntaxAstCallExtender.find_comparator(type(right)) if SyntaxAstCallExtender.comparators else None
+        return self._compare(ctx, key, op, left, right, func)
+
+    def _compare(self, ctx, key, op, left, right, func):
+        """ compare with func, the comparator of right resolved ahead, or through the compare of a subclass
+            overriding it """
+        if custom_compare(self):
+            return self.compare(ctx, key, op, left, right)
+
+        elif func:
+            return safe_monad(func, ctx, key, op, left, right)
+
+        err = incompatible(op, left, right)
+        return (None, err) if err else safe_monad(op, left, right)
+
+    def eval(self, ctx):
+        raise NotImplementedError
+
+    def compile(self):
+        return criteria_class.instance(Const.Compiled, self)
+
+    def adaptive(self, period=1024, any_order=False):
+        """ compiled criteria reordering children of All/Any by their cost and how often they decide, see Adaptive """
+        return criteria_class.instance(Const.Adaptive, self, period, any_order)
+
+    def _compile(self):
+        """ closure of (ctx, fuzzy) -> (ans, err), falls back to eval when not specialized """
+        def fn(ctx, fuzzy):
+            return self.eval(ctx)
+
+        return fn
+
+    def filter(self, iterable, fuzzy=False, on_error=Const.exclude):
+        """ lazily yield matched objs, on_error decides to exclude, include or raise for UNKNOWN/ERROR outcomes """
+        return (obj for (obj, matched) in matches(self._compile(), iterable, fuzzy, on_error) if matched)
+
+    def filter_parallel(self, iterable, workers=None, chunksize=1024, fuzzy=False, on_error=Const.exclude, ordered=True):
+        """ lazily yield matched objs evaluated by a pool of worker processes, in order or as chunks complete,
+            objs must be picklable and the outcomes and on_error are the same as filter """
+        from beval.parallel import parallel_filter
+        return parallel_filter(self, iterable, workers, chunksize, fuzzy, on_error, ordered)
+
+    def filter_csv(self, source, sink, fuzzy=False, on_error=Const.exclude, convert=csv_value, buffersize=1 << 20,
+                   chunksize=1024, dialect="excel"):
+        """ write the header and the rows of csv source matched to sink, source is read in buffersize calls and rows
+            are evaluated in chunks, only the required columns are decoded by convert, returns rows written """
+        from beval.stream import csv_filter
+        return csv_filter(self, source, sink, fuzzy, on_error, convert, buffersize, chunksize, dialect)
+
+    def filter_jsonl(self, source, sink, fuzzy=False, on_error=Const.exclude, buffersize=1 << 20):
+        """ write the json lines of source matched to sink as they are, each chunk of lines read in one buffersize call
+            is evaluated before the next, only the required keys are kept once decoded, returns lines written """
+        from beval.stream import jsonl_filter
+        return jsonl_filter(self, source, sink, fuzzy, on_error, buffersize)
+
+    def evaluator(self, fuzzy=False, ctx=None):
+        """ function of obj to (ans, err) reusing one ctx, a RowCtx for rows for instance, see Evaluator """
+        return criteria_class.instance(Const.Evaluator, self, fuzzy, ctx)
+
+    def partition(self, iterable, fuzzy=False, on_error=Const.exclude):
+        (positive, negative) = (list(), list())
+        for (obj, matched) in matches(self._compile(), iterable, fuzzy, on_error):
+            (positive if matched else negative).append(obj)
+
+        return positive, negative
+
+    def count(self, iterable, fuzzy=False, on_error=Const.exclude):
+        return sum(1 for _ in self.filter(iterable, fuzzy, on_error))
+
+    def first(self, iterable, default=None, fuzzy=False, on_error=Const.exclude):
+        for obj in self.filter(iterable, fuzzy, on_error):
+            return obj
+
+        return default
+
+    def exists(self, iterable, fuzzy=False, on_error=Const.exclude):
+        for _ in self.filter(iterable, fuzzy, on_error):
+            return True
+
+        return False
+
+    def vectorize(self, columns, fuzzy=False):
+        """ evaluate against a dict of arrays or a DataFrame, returns Masks of True/False/UNKNOWN/ERROR rows """
+        if numpy is None:
+            raise ImportError("numpy is required for vectorized evaluation")
+
+        size = columns_size(columns)
+        with numpy.errstate(all="ignore"):
+            (ans, bad) = self._vectorize(columns, size, fuzzy)
+
+        return masks_of(ans, bad, fuzzy)
+
+    def vectorize_parallel(self, columns, fuzzy=False, workers=None, chunksize=None):
+        """ vectorize with row ranges split across worker processes, columns are put in shared memory once
+            or given as SharedColumns to reuse, the masks are written by workers to shared memory too """
+        if numpy is None:
+            raise ImportError("numpy is required for vectorized evaluation")
+
+        from beval.parallel import parallel_vectorize
+        return parallel_vectorize(self, columns, fuzzy, workers, chunksize)
+
+    def _vectorize(self, columns, size, fuzzy):
+        """ (ans, bad) bool arrays, falls back to row by row evaluation when not specialized """
+        keys = list(columns.keys())
+        func = self._compile()
+        rows = zip(*[numpy.asarray(columns[key]).tolist() for key in keys]) if keys else [()] * size
+        return outcomes_to_arrays(
+            [func(criteria_class.instance(Const.Ctx, dict(zip(keys, row)), fuzzy), fuzzy)[0] for row in rows])
+
+    def fuzzy(self, ctx):
+        return ctx.fuzzy or False
+
+    def optimize(self):
+        """ equivalent criteria with fewer nodes, the same outcomes in strict and fuzzy mode """
+        return self
+
+    def required_keys(self):
+        """ frozenset of keys looked up in ctx during evaluation """
+        return frozenset()
+
+    def _signature(self):
+        """ tuple of what makes two nodes of the same class equal, nodes are only equal to themselves by default """
+        return id(self),
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+
+        elif type(self) is not type(other) or hash(self) != hash(other):
+            return False
+
+        return self._signature() == other._signature()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        """ computed once per node, children hash before their parents """
+        obj = getattr(self, "_hash", None)
+        if obj is None:
+            obj = self._hash = hash((type(self).__name__,) + self._signature())
+
+        return obj
+
+    def __init__(self, stack=False):
+        """ stack is accepted and ignored, node classes written for the builder on Criteria still pass stack=False """
+        self._hash = None
+
+
+class Builder(Criteria):
+    """ builds a criteria in polish notation, sort of, returned by Criteria() """
+
+    __slots__ = ("_stack",)
+
+    def __init__(self):
+        super(Builder, self).__init__()
+        self._stack = list()
+
+    def size(self):
+        return len(self._stack)
+
+    def _push(self, item):
+        self._stack.append(item)
+
+    def _pop(self):
+        return self._stack.pop()
+
+    def Bool(self, key):
+        c = criteria_class.instance(Const.Bool, key)
+        self._push(c)
+        return self
+
+    def Eq(self, key, right):
+        c = criteria_class.instance(Const.Eq, key, right)
+        self._push(c)
+        return self
+
+    def NotEq(self, key, right):
+        c = criteria_class.instance(Const.NotEq, key, right)
+        self._push(c)
+        return self
+
+    def LtE(self, key, right):
+        c = criteria_class.instance(Const.LtE, key, right)
+        self._push(c)
+        return self
 
     def Lt(self, key, right):
         c = criteria_class.instance(Const.Lt, key, right)
@@ -286,16 +1133,18 @@ class Criteria(object):
 
 class Bool(Criteria):
 
+    __slots__ = ("_key",)
+
     @property
     def key(self):
         return self._key
 
     def __init__(self, key):
-        super(Bool, self).__init__(stack=False)
+        super(Bool, self).__init__()
         self._key = types_supported_as_key(self, key)
 
     def eval(self, ctx):
-        (obj, err) = safe_monad(access, ctx, self._key)
+        (obj, err) = self._access(ctx)
 
         if err is None:
             if isinstance(obj, bool):
@@ -313,12 +1162,62 @@ class Bool(Criteria):
         else:
             return Const.UNKNOWN if self.fuzzy(ctx) else Const.ERROR, err
 
+    def _compile(self):
+        if not specializes(self):
+            return Criteria._compile(self)
+
+        key = self._key
+
+        def fn(ctx, fuzzy):
+            obj = ctx.lookup(key)
+
+            if obj is missing:
+                return Const.UNKNOWN if fuzzy else Const.ERROR, key_error(key)
+
+            elif isinstance(obj, bool):
+                return obj, None
+
+            elif isinstance(obj, numbers.Number):
+                return bool(obj), None
+
+            elif isinstance(obj, str) and obj.lower() in (Const.true, Const.false,):
+                return True if obj.lower() == Const.true else False, None
+
+            else:
+                return Const.UNKNOWN if fuzzy else Const.ERROR, TypeError("%s is not supported" % type(obj))
+
+        return fn
+
+    def _vectorize(self, columns, size, fuzzy):
+        return vectorize_leaf(self, columns, size, fuzzy)
+
+    def _vectorize_values(self, values):
+        if values.dtype == bool:
+            return values
+
+        elif values.dtype.kind in "iufc":
+            return values != 0
+
+        else:
+            return None
+
+    def __reduce__(self):
+        return type(self), (self._key,)
+
+    def required_keys(self):
+        return leaf_keys(self)
+
+    def _signature(self):
+        return self._key,
+
     def __str__(self):
         return "%s" % self._key
 
 
 class Eq(Criteria):
 
+    __slots__ = ("_op", "_key", "_right", "_comparator", "_version",)
+
     @property
     def key(self):
         return self._key
@@ -332,16 +1231,25 @@ class Eq(Criteria):
         return self._op
 
     def __init__(self, key, right, op=operator.eq):
-        super(Eq, self).__init__(stack=False)
+        super(Eq, self).__init__()
         self._op = op
         self._key = types_supported_as_key(self, key)
         self._right = right
+        self._bind()
+
+    def _bind(self):
+        """ resolve the comparator of right once, and again after extenders are registered """
+        self._comparator = SyntaxAstCallExtender.find_comparator(type(self._right))
+        self._version = SyntaxAstCallExtender.version
 
     def eval(self, ctx):
-        (obj, err) = safe_monad(access, ctx, self._key)
+        (obj, err) = self._access(ctx)
 
         if err is None:
-            (obj_, err_) = self.compare(ctx, self._key, self._op, obj, self._right)
+            if self._version != SyntaxAstCallExtender.version:
+                self._bind()
+
+            (obj_, err_) = self._compare(ctx, self._key, self._op, obj, self._right, self._comparator)
 
             if err_ is None:
                 return obj_, None
@@ -352,12 +1260,61 @@ class Eq(Criteria):
         else:
             return Const.UNKNOWN if self.fuzzy(ctx) else Const.ERROR, err
 
+    def _compile(self):
+        if not specializes(self):
+            return Criteria._compile(self)
+
+        (node, key, op, right) = (self, self._key, self._op, self._right)
+
+        def fn(ctx, fuzzy):
+            obj = ctx.lookup(key)
+
+            if obj is missing:
+                return Const.UNKNOWN if fuzzy else Const.ERROR, key_error(key)
+
+            if node._version != SyntaxAstCallExtender.version:
+                node._bind()
+
+            func = node._comparator
+            err = None if func else incompatible(op, obj, right)
+
+            if err is None:
+                try:
+                    return func(ctx, key, op, obj, right) if func else op(obj, right), None
+
+                except Exception as err_:
+                    err = err_
+
+            return Const.UNKNOWN if fuzzy else Const.ERROR, err
+
+        return fn
+
+    def _vectorize(self, columns, size, fuzzy):
+        return vectorize_leaf(self, columns, size, fuzzy)
+
+    def _vectorize_values(self, values):
+        if not comparable(values, self._right):
+            return None
+
+        return elementwise(self._op(values, self._right), values)
+
+    def __reduce__(self):
+        return type(self), (self._key, self._right, self._op)
+
+    def required_keys(self):
+        return leaf_keys(self)
+
+    def _signature(self):
+        return self._key, self._op, value_key(self._right)
+
     def __str__(self):
         return "%s %s %s" % (self._key, operator_ser_symbol.lookup(self._op), quote(self._right))
 
 
 class NotEq(Eq):
 
+    __slots__ = ()
+
     @property
     def op(self):
         return operator.ne
@@ -365,173 +1322,986 @@ class NotEq(Eq):
     def __init__(self, key, right):
         super(NotEq, self).__init__(key, right)
 
-    def eval(self, ctx):
-        (obj, err) = super(NotEq, self).eval(ctx)
-        return not obj if obj in (True, False,) else obj, err
+    def __reduce__(self):
+        return type(self), (self._key, self._right)
+
+    def eval(self, ctx):
+        (obj, err) = super(NotEq, self).eval(ctx)
+        return not obj if obj in (True, False,) else obj, err
+
+    def _compile(self):
+        if not specializes(self):
+            return Criteria._compile(self)
+
+        return negate(super(NotEq, self)._compile())
+
+    def _vectorize_values(self, values):
+        ans = super(NotEq, self)._vectorize_values(values)
+        return None if ans is None else ~ans
+
+    def __str__(self):
+        return "%s %s %s" % (self._key, operator_ser_symbol.lookup(self.op), quote(self._right))
+
+
+class Lt(Eq):
+
+    __slots__ = ()
+
+    def __init__(self, key, right):
+        super(Lt, self).__init__(key, right, operator.lt)
+
+    def __reduce__(self):
+        return type(self), (self._key, self._right)
+
+
+class LtE(Eq):
+
+    __slots__ = ()
+
+    def __init__(self, key, right):
+        super(LtE, self).__init__(key, right, operator.le)
+
+    def __reduce__(self):
+        return type(self), (self._key, self._right)
+
+
+class Gt(Eq):
+
+    __slots__ = ()
+
+    def __init__(self, key, right):
+        super(Gt, self).__init__(key, right, operator.gt)
+
+    def __reduce__(self):
+        return type(self), (self._key, self._right)
+
+
+class GtE(Eq):
+
+    __slots__ = ()
+
+    def __init__(self, key, right):
+        super(GtE, self).__init__(key, right, operator.ge)
+
+    def __reduce__(self):
+        return type(self), (self._key, self._right)
+
+
+class Between(Criteria):
+
+    __slots__ = ("_lower", "_lower_op", "_key", "_upper_op", "_upper", "_comparator", "_version",)
+
+    @property
+    def lower(self):
+        return self._lower
+
+    @property
+    def lower_op(self):
+        return self._lower_op
+
+    @property
+    def key(self):
+        return self._key
+
+    @property
+    def upper_op(self):
+        return self._upper_op
+
+    @property
+    def upper(self):
+        return self._upper
+
+    def __init__(self, lower, key, upper, lower_op=operator.le, upper_op=operator.lt):
+        super(Between, self).__init__()
+        self._lower = lower
+        self._lower_op = lower_op
+        self._key = types_supported_as_key(self, key)
+        self._upper_op = upper_op
+        self._upper = upper
+        self._bind()
+
+    def _bind(self):
+        """ resolve the comparator of upper once, and again after extenders are registered """
+        self._comparator = SyntaxAstCallExtender.find_comparator(type(self._upper))
+        self._version = SyntaxAstCallExtender.version
+
+    def eval(self, ctx):
+        (obj, err) = self._access(ctx)
+
+        if err is None:
+            (obj_, err_) = self.compare(ctx, self._key, self._lower_op, self._lower, obj)
+
+            if obj_ in (True,):
+                if self._version != SyntaxAstCallExtender.version:
+                    self._bind()
+
+                (obj2_, err2_) = self._compare(ctx, self._key, self._upper_op, obj, self._upper, self._comparator)
+
+                if err2_ is None:
+                    return obj2_, None
+
+                else:
+                    return Const.UNKNOWN if self.fuzzy(ctx) else Const.ERROR, err2_
+
+            else:
+                if err_ is None:
+                    return obj_, None
+
+                else:
+                    return Const.UNKNOWN if self.fuzzy(ctx) else Const.ERROR, err_
+
+        else:
+            return Const.UNKNOWN if self.fuzzy(ctx) else Const.ERROR, err
+
+    def _compile(self):
+        if not specializes(self):
+            return Criteria._compile(self)
+
+        (lower, lower_op, key, upper_op, upper) = (self._lower, self._lower_op, self._key, self._upper_op, self._upper)
+        (node, comparators, find) = (self, SyntaxAstCallExtender.comparators, SyntaxAstCallExtender.find_comparator)
+
+        def fn(ctx, fuzzy):
+            obj = ctx.lookup(key)
+
+            if obj is missing:
+                return Const.UNKNOWN if fuzzy else Const.ERROR, key_error(key)
+
+            lower_func = find(type(obj)) if comparators else None
+            err = None if lower_func else incompatible(lower_op, lower, obj)
+
+            if err is None:
+                try:
+                    obj_ = lower_func(ctx, key, lower_op, lower, obj) if lower_func else lower_op(lower, obj)
+
+                except Exception as err_:
+                    err = err_
+
+            if err is not None:
+                return Const.UNKNOWN if fuzzy else Const.ERROR, err
+
+            elif obj_ not in (True,):
+                return obj_, None
+
+            if node._version != SyntaxAstCallExtender.version:
+                node._bind()
+
+            func = node._comparator
+            err = None if func else incompatible(upper_op, obj, upper)
+            if err is None:
+                try:
+                    return func(ctx, key, upper_op, obj, upper) if func else upper_op(obj, upper), None
+
+                except Exception as err_:
+                    err = err_
+
+            return Const.UNKNOWN if fuzzy else Const.ERROR, err
+
+        return fn
+
+    def _vectorize(self, columns, size, fuzzy):
+        return vectorize_leaf(self, columns, size, fuzzy)
+
+    def _vectorize_values(self, values):
+        if not comparable(values, self._lower, self._upper):
+            return None
+
+        lower = elementwise(self._lower_op(self._lower, values), values)
+        return lower & elementwise(self._upper_op(values, self._upper), values)
+
+    def __reduce__(self):
+        return type(self), (self._lower, self._key, self._upper, self._lower_op, self._upper_op)
+
+    def required_keys(self):
+        return leaf_keys(self)
+
+    def _signature(self):
+        return value_key(self._lower), self._lower_op, self._key, self._upper_op, value_key(self._upper)
+
+    def __str__(self):
+        return "%s %s %s %s %s" % \
+            (self._lower, operator_ser_symbol.lookup(self._lower_op),
+                self._key, operator_ser_symbol.lookup(self._upper_op), self._upper)
+
+
+class In(Eq):
+
+    __slots__ = ("_index", "_rest", "_comparators",)
+
+    def __init__(self, key, *right):
+        super(In, self).__init__(key, right)
+
+    def _bind(self):
+        super(In, self)._bind()
+        self._build_index()
+
+    def _build_index(self):
+        """ index candidates of builtin types by value to their 1st position, the rest are scanned linearly,
+            the comparator of each candidate is resolved once """
+        (index, rest) = (dict(), list())
+        comparators = tuple(SyntaxAstCallExtender.find_comparator(type(one)) for one in self._right)
+        for position, one in enumerate(self._right):
+            if type(one) in hashable_types and one == one and not comparators[position]:
+                index.setdefault(one, position)
+
+            else:
+                rest.append((position, one))
+
+        self._index = index
+        self._rest = tuple(rest)
+        self._comparators = comparators
+
+    def _scan(self, ctx, obj, fuzzy):
+        if self._version != SyntaxAstCallExtender.version:
+            self._bind()
+
+        size = len(self._right)
+        if type(obj) in hashable_types and not custom_compare(self):
+            (position, negative, candidates) = (self._index.get(obj, size), size - len(self._rest), self._rest)
+
+        else:
+            (position, negative, candidates) = (size, 0, enumerate(self._right))
+
+        first_error = None
+        for (p, one) in candidates:
+            if p > position:
+                break
+
+            (obj_, err_) = self._compare(ctx, self._key, self._op, obj, one, self._comparators[p])
+            if obj_ in (True,):
+                return obj_, first_error or err_
+
+            elif obj_ in (False,):
+                negative += 1
+                first_error = first_error or err_
+
+            else:
+                if fuzzy:
+                    first_error = first_error or err_
+
+                else:
+                    return Const.ERROR, first_error or err_
+
+        if position < size:
+            return True, first_error
+
+        elif negative > 0:
+            return False, first_error
+
+        else:
+            return Const.UNKNOWN if fuzzy else Const.ERROR, first_error
+
+    def eval(self, ctx):
+        (obj, err) = self._access(ctx)
+
+        if err is None:
+            return self._scan(ctx, obj, self.fuzzy(ctx))
+
+        else:
+            return Const.UNKNOWN if self.fuzzy(ctx) else Const.ERROR, err
+
+    def _compile(self):
+        if not specializes(self):
+            return Criteria._compile(self)
+
+        (key, scan) = (self._key, self._scan)
+
+        def fn(ctx, fuzzy):
+            obj = ctx.lookup(key)
+
+            if obj is missing:
+                return Const.UNKNOWN if fuzzy else Const.ERROR, key_error(key)
+
+            return scan(ctx, obj, fuzzy)
+
+        return fn
+
+    def _vectorize_values(self, values):
+        if not self._right or not comparable(values, *self._right):
+            return None
+
+        if len(self._right) > 16 and not self._rest and values.dtype != object:
+            index = self._index
+            return numpy.array([one in index for one in values.tolist()], dtype=bool)
+
+        ans = numpy.zeros(values.shape, dtype=bool)
+        for one in self._right:
+            ans |= elementwise(self._op(values, one), values)
+
+        return ans
+
+    def __reduce__(self):
+        return type(self), (self._key,) + self._right
+
+    def _signature(self):
+        return (self._key, self._op) + tuple(value_key(one) for one in self._right)
+
+    def __str__(self):
+        return "%s %s (%s,)" % (self._key, operator_ser_symbol.lookup(Const.in_), ",".join(quote(one) for one in self._right))
+
+
+class NotIn(In):
+
+    __slots__ = ()
+
+    def __init__(self, key, *right):
+        super(NotIn, self).__init__(key, *right)
+
+    def eval(self, ctx):
+        (obj, err) = super(NotIn, self).eval(ctx)
+        return not obj if obj in (True, False,) else obj, err
+
+    def _compile(self):
+        if not specializes(self):
+            return Criteria._compile(self)
+
+        return negate(super(NotIn, self)._compile())
+
+    def _vectorize_values(self, values):
+        ans = super(NotIn, self)._vectorize_values(values)
+        return None if ans is None else ~ans
+
+    def __str__(self):
+        return "%s %s (%s,)" % (self._key, operator_ser_symbol.lookup(Const.not_in_), ",".join(quote(one) for one in self._right))
+
+
+class All(Criteria):
+
+    __slots__ = ("_many",)
+
+    @property
+    def many(self):
+        return self._many
+
+    def __init__(self, *many):
+        super(All, self).__init__()
+        for one in many:
+            if not isinstance(one, Criteria):
+                raise TypeError("%s is not supported" % type(one))
+
+        self._many = many
+
+    def eval(self, ctx):
+        positive = 0
+        first_error = None
+
+        for one in self._many:
+            (obj, err) = one.eval(ctx) if production else one(ctx)
+
+            if obj in (True,):
+                positive += 1
+                first_error = first_error or err
+
+            elif obj in (False,):
+                return obj, first_error or err
+
+            else:
+                if self.fuzzy(ctx):
+                    first_error = first_error or err
+
+                else:
+                    return Const.ERROR, first_error or err
+
+        if positive > 0:
+            return True, first_error
+
+        else:
+            return Const.UNKNOWN if self.fuzzy(ctx) else Const.ERROR, first_error
+
+    def _compile(self):
+        if not specializes(self):
+            return Criteria._compile(self)
+
+        many = tuple(one._compile() for one in self._many)
+
+        def fn(ctx, fuzzy):
+            positive = 0
+            first_error = None
+
+            for one in many:
+                (obj, err) = one(ctx, fuzzy)
+
+                if obj in (True,):
+                    positive += 1
+                    first_error = first_error or err
+
+                elif obj in (False,):
+                    return obj, first_error or err
+
+                elif fuzzy:
+                    first_error = first_error or err
+
+                else:
+                    return Const.ERROR, first_error or err
+
+            if positive > 0:
+                return True, first_error
+
+            else:
+                return Const.UNKNOWN if fuzzy else Const.ERROR, first_error
+
+        return fn
+
+    def _vectorize(self, columns, size, fuzzy):
+        if not specializes(self):
+            return Criteria._vectorize(self, columns, size, fuzzy)
+
+        if fuzzy:
+            (positive, negative) = (numpy.zeros(size, dtype=bool), numpy.zeros(size, dtype=bool))
+            for one in self._many:
+                (ans, bad) = one._vectorize(columns, size, fuzzy)
+                positive |= ~bad & ans
+                negative |= ~bad & ~ans
+
+            return ~negative, ~negative & ~positive
+
+        """ rows stay pending until the first child which is not True """
+        (ans_, bad_, pending) = (numpy.ones(size, dtype=bool), numpy.zeros(size, dtype=bool), numpy.ones(size, dtype=bool))
+        for one in self._many:
+            (ans, bad) = one._vectorize(columns, size, fuzzy)
+            bad_ |= pending & bad
+            ans_ &= ~(pending & ~bad & ~ans)
+            pending &= ~bad & ans
+
+            if not pending.any():
+                break
+
+        return ans_, bad_ if self._many else numpy.ones(size, dtype=bool)
+
+    def __reduce__(self):
+        return type(self), self._many
+
+    def optimize(self):
+        return optimize_many(self, (All, And,), False)
+
+    def required_keys(self):
+        return frozenset().union(*[one.required_keys() for one in self._many])
+
+    def _signature(self):
+        return self._many
+
+    def __str__(self):
+        return (" %s " % operator_ser_symbol.lookup(Const.and_)).join(str(one) for one in self._many)
+
+
+class Any(All):
+
+    __slots__ = ()
+
+    def eval(self, ctx):
+        negative = 0
+        first_error = None
+
+        for one in self._many:
+            (obj, err) = one.eval(ctx) if production else one(ctx)
+
+            if obj in (True,):
+                return obj, first_error or err
+
+            elif obj in (False,):
+                negative += 1
+                first_error = first_error or err
+
+            else:
+                if self.fuzzy(ctx):
+                    first_error = first_error or err
+
+                else:
+                    return Const.ERROR, first_error or err
+
+        if negative > 0:
+            return False, first_error
+
+        else:
+            return Const.UNKNOWN if self.fuzzy(ctx) else Const.ERROR, first_error
+
+    def _compile(self):
+        if not specializes(self):
+            return Criteria._compile(self)
+
+        many = tuple(one._compile() for one in self._many)
+
+        def fn(ctx, fuzzy):
+            negative = 0
+            first_error = None
+
+            for one in many:
+                (obj, err) = one(ctx, fuzzy)
+
+                if obj in (True,):
+                    return obj, first_error or err
+
+                elif obj in (False,):
+                    negative += 1
+                    first_error = first_error or err
+
+                elif fuzzy:
+                    first_error = first_error or err
+
+                else:
+                    return Const.ERROR, first_error or err
+
+            if negative > 0:
+                return False, first_error
+
+            else:
+                return Const.UNKNOWN if fuzzy else Const.ERROR, first_error
+
+        return fn
+
+    def _vectorize(self, columns, size, fuzzy):
+        if not specializes(self):
+            return Criteria._vectorize(self, columns, size, fuzzy)
+
+        if fuzzy:
+            (positive, negative) = (numpy.zeros(size, dtype=bool), numpy.zeros(size, dtype=bool))
+            for one in self._many:
+                (ans, bad) = one._vectorize(columns, size, fuzzy)
+                positive |= ~bad & ans
+                negative |= ~bad & ~ans
+
+            return positive, ~positive & ~negative
+
+        """ rows stay pending until the first child which is not False """
+        (ans_, bad_, pending) = (numpy.zeros(size, dtype=bool), numpy.zeros(size, dtype=bool), numpy.ones(size, dtype=bool))
+        for one in self._many:
+            (ans, bad) = one._vectorize(columns, size, fuzzy)
+            bad_ |= pending & bad
+            ans_ |= pending & ~bad & ans
+            pending &= ~bad & ~ans
+
+            if not pending.any():
+                break
+
+        return ans_, bad_ if self._many else numpy.ones(size, dtype=bool)
+
+    def optimize(self):
+        return optimize_many(self, (Any, Or,), True)
+
+    def __str__(self):
+        return (" %s " % operator_ser_symbol.lookup(Const.or_)).join( str(one) for one in self._many)
+
+
+class And(All):
+
+    __slots__ = ()
+
+    @property
+    def left(self):
+        return self._many[0]
+
+    @property
+    def right(self):
+        return self._many[1]
+
+    def __init__(self, left, right):
+        super(And, self).__init__(left, right)
+
+    def __str__(self):
+        return "(%s %s %s)" % (self.left, operator_ser_symbol.lookup(Const.and_), self.right)
+
+
+class Or(Any):
+
+    __slots__ = ()
+
+    @property
+    def left(self):
+        return self._many[0]
+
+    @property
+    def right(self):
+        return self._many[1]
+
+    def __init__(self, left, right):
+        super(Or, self).__init__(left, right)
+
+    def __str__(self):
+        return "(%s %s %s)" % (self.left, operator_ser_symbol.lookup(Const.or_), self.right)
+
+
+class Not(Criteria):
+
+    __slots__ = ("_one",)
+
+    @property
+    def one(self):
+        return self._one
+
+    def __init__(self, one):
+        if not isinstance(one, Criteria):
+            raise TypeError("%s is not supported" % type(one))
+
+        super(Not, self).__init__()
+        self._one = one
+
+    def eval(self, ctx):
+        (obj, err) = self._one.eval(ctx) if production else self._one(ctx)
+        return not obj if obj in (True, False,) else obj, err
+
+    def _compile(self):
+        if not specializes(self):
+            return Criteria._compile(self)
+
+        return negate(self._one._compile())
+
+    def _vectorize(self, columns, size, fuzzy):
+        if not specializes(self):
+            return Criteria._vectorize(self, columns, size, fuzzy)
+
+        (ans, bad) = self._one._vectorize(columns, size, fuzzy)
+        return ~ans, bad
+
+    def __reduce__(self):
+        return type(self), (self._one,)
+
+    def optimize(self):
+        if type(self) is not Not:
+            return self
+
+        one = self._one.optimize()
+        if type(one) is Not:
+            return one.one
+
+        return self if one is self._one else criteria_class.instance(Const.Not, one)
+
+    def required_keys(self):
+        return self._one.required_keys()
+
+    def _signature(self):
+        return self._one,
+
+    def __str__(self):
+        return "%s (%s)" % (operator_ser_symbol.lookup(Const.not_), str(self._one))
+
+
+class Compiled(Criteria):
+
+    __slots__ = ("_criteria", "_func",)
+
+    @property
+    def criteria(self):
+        return self._criteria
+
+    def __init__(self, criteria):
+        super(Compiled, self).__init__()
+        self._criteria = criteria
+        self._func = criteria._compile()
+
+    def __call__(self, obj, fuzzy=False):
+        ctx = ctx_of(obj, fuzzy)
+        return self._func(ctx, ctx.fuzzy)
+
+    def eval(self, ctx):
+        return self._func(ctx, ctx.fuzzy)
+
+    def compile(self):
+        return self
+
+    def _compile(self):
+        return self._func
+
+    def _vectorize(self, columns, size, fuzzy):
+        return self._criteria._vectorize(columns, size, fuzzy)
+
+    def __reduce__(self):
+        return type(self), (self._criteria,)
+
+    def optimize(self):
+        criteria = self._criteria.optimize()
+        return self if criteria is self._criteria else criteria.compile()
+
+    def required_keys(self):
+        return self._criteria.required_keys()
+
+    def _signature(self):
+        return self._criteria,
+
+    def __str__(self):
+        return str(self._criteria)
+
+
+class Adaptive(Compiled):
+    """ compiled criteria whose All/Any evaluate the cheapest and most often deciding children first.
+        Children are reordered only with any_order, accepting the outcome of some order of the children:
+        in fuzzy mode the answer does not depend on the order but err is the first error met in the new
+        order, in strict mode the first failing child decides between False and ERROR. Without any_order
+        children keep their order and the criteria compiles as by compile, nothing is counted nor timed. """
+
+    __slots__ = ("_period", "_any_order",)
+
+    def __init__(self, criteria, period=1024, any_order=False):
+        super(Compiled, self).__init__()
+        self._criteria = criteria
+        self._period = period
+        self._any_order = any_order
+        self._func = adaptive_compile(criteria, period, any_order)
+
+    def adaptive(self, period=1024, any_order=False):
+        return self if (period, any_order) == (self._period, self._any_order) else \
+            criteria_class.instance(Const.Adaptive, self._criteria, period, any_order)
+
+    def __reduce__(self):
+        return type(self), (self._criteria, self._period, self._any_order)
+
+    def optimize(self):
+        criteria = self._criteria.optimize()
+        return self if criteria is self._criteria else criteria.adaptive(self._period, self._any_order)
+
+    def _signature(self):
+        return self._criteria, self._period, self._any_order
+
+
+class Universal(object):
+
+    __slots__ = ()
 
-    def __str__(self):
-        return "%s %s %s" % (self._key, operator_ser_symbol.lookup(self.op), quote(self._right))
+    def __eq__(self, other):
+        return True
 
+    def __reduce__(self):
+        return type(self), ()
 
-class Lt(Eq):
+    def __str__(self):
+        return "'%s'" % Const.universal
 
-    def __init__(self, key, right):
-        super(Lt, self).__init__(key, right, operator.lt)
 
+""" op(value, bound) of a range as (lower, inclusive), lower ones hold for values above the bound """
+range_ops = {
+    operator.lt: (False, False),
+    operator.le: (False, True),
+    operator.gt: (True, False),
+    operator.ge: (True, True),
+}
 
-class LtE(Eq):
 
-    def __init__(self, key, right):
-        super(LtE, self).__init__(key, right, operator.le)
+def indexable(obj):
+    return type(obj) in hashable_types and obj == obj and not SyntaxAstCallExtender.find_comparator(type(obj))
 
 
-class Gt(Eq):
+def range_term(key, op, bound, flip):
+    """ (key, lower, bound, inclusive) of op(value, bound), or of op(bound, value) when flip """
+    if op not in range_ops or type(bound) not in number_types or not indexable(bound):
+        return None
 
-    def __init__(self, key, right):
-        super(Gt, self).__init__(key, right, operator.gt)
+    (lower, inclusive) = range_ops[op]
+    return key, lower != flip, bound, inclusive
 
 
-class GtE(Eq):
+def index_terms(criteria):
+    """ terms which must all hold for a leaf to be True, leaves of other types or with literal keys, which fall back to
+        their literal value when missing, have none """
+    cls = type(criteria)
+    if cls not in (Eq, Lt, LtE, Gt, GtE, In, Between) or literal_of(criteria.key) is not missing:
+        return []
 
-    def __init__(self, key, right):
-        super(GtE, self).__init__(key, right, operator.ge)
+    elif cls is In:
+        values = criteria.right
+        return [(criteria.key, None, set(values), None)] if all(indexable(one) for one in values) else []
 
+    elif cls is Between:
+        terms = [range_term(criteria.key, criteria.lower_op, criteria.lower, True),
+                 range_term(criteria.key, criteria.upper_op, criteria.upper, False)]
+        return [term for term in terms if term]
 
-class Between(Criteria):
+    elif criteria.op is operator.eq:
+        return [(criteria.key, None, set([criteria.right]), None)] if indexable(criteria.right) else []
 
-    @property
-    def lower(self):
-        return self._lower
+    else:
+        term = range_term(criteria.key, criteria.op, criteria.right, False)
+        return [term] if term else []
 
-    @property
-    def lower_op(self):
-        return self._lower_op
 
-    @property
-    def key(self):
-        return self._key
+def conjuncts(criteria):
+    criteria = criteria.criteria if type(criteria) is Compiled else criteria
+    if type(criteria) in (All, And):
+        return [one for many in criteria.many for one in conjuncts(many)]
 
-    @property
-    def upper_op(self):
-        return self._upper_op
+    return [criteria]
 
-    @property
-    def upper(self):
-        return self._upper
 
-    def __init__(self, lower, key, upper, lower_op=operator.le, upper_op=operator.lt):
-        super(Between, self).__init__(stack=False)
-        self._lower = lower
-        self._lower_op = lower_op
-        self._key = types_supported_as_key(self, key)
-        self._upper_op = upper_op
-        self._upper = upper
+def alternatives(criteria):
+    """ conjunct lists, one of them must all hold for criteria to be True """
+    criteria = criteria.criteria if type(criteria) is Compiled else criteria
+    if type(criteria) in (Any, Or):
+        return [conjuncts(one) for one in criteria.many]
 
-    def eval(self, ctx):
-        (obj, err) = safe_monad(access, ctx, self._key)
+    return [conjuncts(criteria)]
 
-        if err is None:
-            (obj_, err_) = self.compare(ctx, self._key, self._lower_op, self._lower, obj)
 
-            if obj_ in (True,):
-                (obj2_, err2_) = self.compare(ctx, self._key, self._upper_op, obj, self._upper)
+class Bounds(object):
+    """ sorted bounds of half lines on one key, lower ones hold for values above, upper ones for values below """
 
-                if err2_ is None:
-                    return obj2_, None
+    __slots__ = ("_lower", "_bounds", "_entries",)
 
-                else:
-                    return Const.UNKNOWN if self.fuzzy(ctx) else Const.ERROR, err2_
+    def __init__(self, lower):
+        self._lower = lower
+        self._bounds = list()
+        self._entries = list()
 
-            else:
-                if err_ is None:
-                    return obj_, None
+    def add(self, bound, inclusive, alternative):
+        position = bisect.bisect_right(self._bounds, bound)
+        self._bounds.insert(position, bound)
+        self._entries.insert(position, (inclusive, alternative))
 
-                else:
-                    return Const.UNKNOWN if self.fuzzy(ctx) else Const.ERROR, err_
+    def satisfied(self, obj):
+        (left, right) = (bisect.bisect_left(self._bounds, obj), bisect.bisect_right(self._bounds, obj))
+        ties = [alternative for (inclusive, alternative) in self._entries[left:right] if inclusive]
+        return [alternative for (_, alternative) in (self._entries[:left] if self._lower else self._entries[right:])] + ties
 
-        else:
-            return Const.UNKNOWN if self.fuzzy(ctx) else Const.ERROR, err
 
-    def __str__(self):
-        return "%s %s %s %s %s" % \
-            (self._lower, operator_ser_symbol.lookup(self._lower_op),
-                self._key, operator_ser_symbol.lookup(self._upper_op), self._upper)
+class KeyIndex(object):
+    """ terms on one key, values of Eq/In hashed to alternatives, range bounds sorted """
 
+    __slots__ = ("_values", "_hashed", "_lower", "_upper", "_ranged",)
 
-class In(Eq):
+    @property
+    def all(self):
+        return self._hashed + self._ranged
 
-    def __init__(self, key, *right):
-        super(In, self).__init__(key, right)
+    def __init__(self):
+        self._values = dict()
+        self._hashed = list()
+        self._lower = Bounds(True)
+        self._upper = Bounds(False)
+        self._ranged = list()
 
-    def eval(self, ctx):
-        (obj, err) = safe_monad(access, ctx, self._key)
+    def add(self, lower, obj, inclusive, alternative):
+        if lower is None:
+            for one in obj:
+                self._values.setdefault(one, list()).append(alternative)
 
-        if err is None:
-            negative = 0
-            first_error = None
+            self._hashed.append(alternative)
 
-            for one in self.right:
-                (obj_, err_) = self.compare(ctx, self._key, self._op, obj, one)
-                if obj_ in (True,):
-                    return obj_, first_error or err_
+        else:
+            (self._lower if lower else self._upper).add(obj, inclusive, alternative)
+            self._ranged.append(alternative)
 
-                elif obj_ in (False,):
-                    negative += 1
-                    first_error = first_error or err_
+    def satisfied(self, obj):
+        """ alternatives, once per term, whose term on this key holds or may hold for obj """
+        comparable = not SyntaxAstCallExtender.find_comparator(type(obj))
+        if comparable and numpy is not None and isinstance(obj, numpy.number):
+            obj = obj.item()
 
-                else:
-                    if self.fuzzy(ctx):
-                        first_error = first_error or err_
+        if comparable and type(obj) in hashable_types:
+            alternatives = list(self._values.get(obj, ()))
 
-                    else:
-                        return Const.ERROR, first_error or err_
+        else:
+            alternatives = list(self._hashed)
 
-            if negative > 0:
-                return False, first_error
+        if not self._ranged:
+            return alternatives
 
-            else:
-                return Const.UNKNOWN if self.fuzzy(ctx) else Const.ERROR, first_error
+        elif comparable and (type(obj) in number_types or type(obj) is bool):
+            return alternatives + (self._lower.satisfied(obj) + self._upper.satisfied(obj) if obj == obj else [])
 
         else:
-            return Const.UNKNOWN if self.fuzzy(ctx) else Const.ERROR, err
+            return alternatives + self._ranged
 
-    def __str__(self):
-        return "%s %s (%s,)" % (self._key, operator_ser_symbol.lookup(Const.in_), ",".join(quote(one) for one in self._right))
 
+class RuleIndex(object):
+    """ matches one obj against many criteria, only rules whose indexed terms all hold are evaluated,
+        the answers are the same as evaluating every rule on its own """
 
-class NotIn(In):
+    @property
+    def rules(self):
+        return [rule for (rule, _) in self._rules]
+
+    def __init__(self, rules=()):
+        self._rules = list()
+        self._clear()
+
+        for rule in rules:
+            self.add(rule)
+
+    def __len__(self):
+        return len(self._rules)
+
+    def _clear(self):
+        self._owners = list()
+        self._required = list()
+        self._always = list()
+        self._keys = dict()
+        self._version = SyntaxAstCallExtender.version
+
+    def add(self, rule):
+        if not isinstance(rule, Criteria):
+            raise TypeError("%s is not supported" % type(rule))
+
+        position = len(self._rules)
+        self._rules.append((rule, rule._compile()))
+        self._index(position, rule)
+        return position
+
+    def _index(self, position, rule):
+        for many in alternatives(rule):
+            alternative = len(self._owners)
+            terms = [term for one in many for term in index_terms(one)]
+            self._owners.append(position)
+            self._required.append(len(terms))
+
+            if not terms:
+                self._always.append(alternative)
+
+            for (key, lower, obj, inclusive) in terms:
+                index = self._keys.get(key, None) or self._keys.setdefault(key, KeyIndex())
+                index.add(lower, obj, inclusive, alternative)
+
+    def _rebuild(self):
+        """ comparators registered after indexing change which terms are indexable """
+        rules = [rule for (rule, _) in self._rules]
+        self._rules = list()
+        self._clear()
+
+        for rule in rules:
+            self.add(rule)
+
+    def _candidates(self, ctx, fuzzy):
+        if self._version != SyntaxAstCallExtender.version:
+            self._rebuild()
+
+        counts = dict()
+        for (key, index) in self._keys.items():
+            obj = ctx.lookup(key)
+
+            if obj is missing:
+                """ missing keys are errors, which fuzzy All skips """
+                satisfied = index.all if fuzzy else ()
 
-    def __init__(self, key, *right):
-        super(NotIn, self).__init__(key, *right)
+            else:
+                satisfied = index.satisfied(obj)
 
-    def eval(self, ctx):
-        (obj, err) = super(NotIn, self).eval(ctx)
-        return not obj if obj in (True, False,) else obj, err
+            for alternative in satisfied:
+                counts[alternative] = counts.get(alternative, 0) + 1
 
-    def __str__(self):
-        return "%s %s (%s,)" % (self._key, operator_ser_symbol.lookup(Const.not_in_), ",".join(quote(one) for one in self._right))
+        required = self._required
+        found = [alternative for (alternative, count) in counts.items() if count == required[alternative]]
+        return sorted(set(self._owners[alternative] for alternative in found + self._always))
 
+    def candidates(self, obj, fuzzy=False):
+        """ rules which may be True for obj, a superset of the matched ones """
+        ctx = ctx_of(obj, fuzzy)
+        return [self._rules[position][0] for position in self._candidates(ctx, fuzzy)]
 
-class All(Criteria):
+    def match(self, obj, fuzzy=False):
+        """ rules which are True for obj, in the order they were added """
+        ctx = ctx_of(obj, fuzzy)
+        matched = list()
 
-    @property
-    def many(self):
-        return self._many
+        for position in self._candidates(ctx, fuzzy):
+            (rule, func) = self._rules[position]
+            if func(ctx, fuzzy)[0] in (True,):
+                matched.append(rule)
 
-    def __init__(self, *many):
-        super(All, self).__init__(stack=False)
-        for one in many:
-            if not isinstance(one, Criteria):
-                raise TypeError("%s is not supported" % type(one))
+        return matched
 
-        self._many = many
 
-    def eval(self, ctx):
+def network_all(many):
+    def fn(ctx, fuzzy, outcome):
         positive = 0
         first_error = None
 
-        for one in self._many:
-            (obj, err) = one(ctx)
+        for one in many:
+            (obj, err) = outcome(one)
 
             if obj in (True,):
                 positive += 1
@@ -540,31 +2310,28 @@ class All(Criteria):
             elif obj in (False,):
                 return obj, first_error or err
 
-            else:
-                if self.fuzzy(ctx):
-                    first_error = first_error or err
+            elif fuzzy:
+                first_error = first_error or err
 
-                else:
-                    return Const.ERROR, first_error or err
+            else:
+                return Const.ERROR, first_error or err
 
         if positive > 0:
             return True, first_error
 
         else:
-            return Const.UNKNOWN if self.fuzzy(ctx) else Const.ERROR, first_error
-
-    def __str__(self):
-        return (" %s " % operator_ser_symbol.lookup(Const.and_)).join(str(one) for one in self._many)
+            return Const.UNKNOWN if fuzzy else Const.ERROR, first_error
 
+    return fn
 
-class Any(All):
 
-    def eval(self, ctx):
+def network_any(many):
+    def fn(ctx, fuzzy, outcome):
         negative = 0
         first_error = None
 
-        for one in self._many:
-            (obj, err) = one(ctx)
+        for one in many:
+            (obj, err) = outcome(one)
 
             if obj in (True,):
                 return obj, first_error or err
@@ -573,85 +2340,126 @@ class Any(All):
                 negative += 1
                 first_error = first_error or err
 
-            else:
-                if self.fuzzy(ctx):
-                    first_error = first_error or err
+            elif fuzzy:
+                first_error = first_error or err
 
-                else:
-                    return Const.ERROR, first_error or err
+            else:
+                return Const.ERROR, first_error or err
 
         if negative > 0:
             return False, first_error
 
         else:
-            return Const.UNKNOWN if self.fuzzy(ctx) else Const.ERROR, first_error
+            return Const.UNKNOWN if fuzzy else Const.ERROR, first_error
 
-    def __str__(self):
-        return (" %s " % operator_ser_symbol.lookup(Const.or_)).join( str(one) for one in self._many)
+    return fn
 
 
-class And(All):
+def network_not(one):
+    def fn(ctx, fuzzy, outcome):
+        (obj, err) = outcome(one)
+        return not obj if obj in (True, False,) else obj, err
 
-    @property
-    def left(self):
-        return self._many[0]
+    return fn
 
-    @property
-    def right(self):
-        return self._many[1]
 
-    def __init__(self, left, right):
-        super(And, self).__init__(left, right)
+def network_leaf(func):
+    def fn(ctx, fuzzy, outcome):
+        return func(ctx, fuzzy)
 
-    def __str__(self):
-        return "(%s %s %s)" % (self.left, operator_ser_symbol.lookup(Const.and_), self.right)
+    return fn
 
 
-class Or(Any):
+class RuleNetwork(object):
+    """ evaluates many criteria sharing structurally equal nodes, each distinct node is evaluated
+        at most once per obj and only when a parent needs it, with the outcomes of every rule on its own """
 
     @property
-    def left(self):
-        return self._many[0]
+    def rules(self):
+        return list(self._rules)
 
     @property
-    def right(self):
-        return self._many[1]
+    def size(self):
+        """ number of distinct nodes """
+        return len(self._funcs)
 
-    def __init__(self, left, right):
-        super(Or, self).__init__(left, right)
+    def __init__(self, rules=()):
+        self._rules = list()
+        self._clear()
 
-    def __str__(self):
-        return "(%s %s %s)" % (self.left, operator_ser_symbol.lookup(Const.or_), self.right)
+        for rule in rules:
+            self.add(rule)
 
+    def __len__(self):
+        return len(self._rules)
 
-class Not(Criteria):
+    def _clear(self):
+        self._nodes = dict()
+        self._funcs = list()
+        self._roots = list()
+        self._held = list()
+        self._version = SyntaxAstCallExtender.version
 
-    @property
-    def one(self):
-        return self._one
+    def add(self, rule):
+        if not isinstance(rule, Criteria):
+            raise TypeError("%s is not supported" % type(rule))
 
-    def __init__(self, one):
-        if not isinstance(one, Criteria):
-            raise TypeError("%s is not supported" % type(one))
+        self._rules.append(rule)
+        self._roots.append(self._node(rule))
+        return len(self._rules) - 1
 
-        super(Not, self).__init__(stack=False)
-        self._one = one
+    def _node(self, criteria):
+        """ position of the distinct node for criteria, children first """
+        criteria = criteria.criteria if type(criteria) is Compiled else criteria
+        cls = type(criteria)
 
-    def eval(self, ctx):
-        (obj, err) = self._one(ctx)
-        return not obj if obj in (True, False,) else obj, err
+        if cls in (All, And, Any, Or):
+            many = tuple(self._node(one) for one in criteria.many)
+            (signature, func) = ((Any, many), network_any(many)) if cls in (Any, Or) else ((All, many), network_all(many))
 
-    def __str__(self):
-        return "%s (%s)" % (operator_ser_symbol.lookup(Const.not_), str(self._one))
+        elif cls is Not:
+            one = self._node(criteria.one)
+            (signature, func) = ((Not, one), network_not(one))
 
+        else:
+            (signature, func) = (criteria, None)
 
-class Universal(object):
+        position = self._nodes.get(signature, None)
+        if position is None:
+            position = self._nodes[signature] = len(self._funcs)
+            self._funcs.append(func or network_leaf(criteria._compile()))
+            self._held.append(criteria)
 
-    def __eq__(self, other):
-        return True
+        return position
 
-    def __str__(self):
-        return "'%s'" % Const.universal
+    def _rebuild(self):
+        """ comparators registered after building change how leaves compare """
+        rules = self._rules
+        self._rules = list()
+        self._clear()
+
+        for rule in rules:
+            self.add(rule)
+
+    def evaluate(self, obj, fuzzy=False):
+        """ (ans, err) of every rule against obj, in the order they were added """
+        if self._version != SyntaxAstCallExtender.version:
+            self._rebuild()
+
+        (ctx, funcs, memo) = (ctx_of(obj, fuzzy), self._funcs, [None] * len(self._funcs))
+
+        def outcome(position):
+            obj_ = memo[position]
+            if obj_ is None:
+                obj_ = memo[position] = funcs[position](ctx, fuzzy, outcome)
+
+            return obj_
+
+        return [outcome(root) for root in self._roots]
+
+    def match(self, obj, fuzzy=False):
+        """ rules which are True for obj, in the order they were added """
+        return [rule for (rule, (ans, _)) in zip(self._rules, self.evaluate(obj, fuzzy)) if ans in (True,)]
 
 
 class bEvalVisitor(ast.NodeVisitor):
@@ -798,11 +2606,34 @@ class SyntaxAstCallExtender(object):
 
     deserializers = dict()
     comparators = dict()
+    version = 0
+
+    """ (version, comparator per type) resolved along the mro, dropped when the version changes """
+    resolved = (0, dict())
 
     @classmethod
     def register(cls, extender):
         SyntaxAstCallExtender.deserializers[extender.name()] = extender
         SyntaxAstCallExtender.comparators[extender.type()] = extender
+        SyntaxAstCallExtender.changed()
+
+    @classmethod
+    def unregister(cls, extender):
+        """ remove extender where it is still the one registered for its name and type """
+        if SyntaxAstCallExtender.deserializers.get(extender.name(), None) is extender:
+            del SyntaxAstCallExtender.deserializers[extender.name()]
+
+        if SyntaxAstCallExtender.comparators.get(extender.type(), None) is extender:
+            del SyntaxAstCallExtender.comparators[extender.type()]
+
+        SyntaxAstCallExtender.changed()
+
+    @classmethod
+    def changed(cls):
+        """ drop what was resolved or parsed with the extenders registered before """
+        SyntaxAstCallExtender.version += 1
+        SyntaxAstCallExtender.resolved = (SyntaxAstCallExtender.version, dict())
+        parse_cache.clear()
 
     @classmethod
     def find_deserializer(cls, name):
@@ -812,9 +2643,25 @@ class SyntaxAstCallExtender(object):
 
     @classmethod
     def find_comparator(cls, type_):
-        extender = SyntaxAstCallExtender.comparators.get(type_, None)
-        if extender:
-            return extender.compare
+        """ compare of the extender registered for type_ or its nearest base, resolved once per type """
+        (version, resolved) = SyntaxAstCallExtender.resolved
+        func = resolved.get(type_, missing) if version == SyntaxAstCallExtender.version else missing
+
+        if func is missing:
+            if version != SyntaxAstCallExtender.version:
+                resolved = dict()
+                SyntaxAstCallExtender.resolved = (SyntaxAstCallExtender.version, resolved)
+
+            func = None
+            for base in getattr(type_, "__mro__", (type_,)):
+                extender = SyntaxAstCallExtender.comparators.get(base, None)
+                if extender:
+                    func = extender.compare
+                    break
+
+            resolved[type_] = func
+
+        return func
 
     def name(self):
         raise NotImplementedError
@@ -843,12 +2690,216 @@ class Config(object):
 
     def override(self, key, obj):
         self._config[key] = obj
+        parse_cache.clear()
 
     def instance(self, key, *args, **kwargs):
         obj = self.lookup(key)
         return obj(*args, **kwargs)
 
 
+class ParseCache(object):
+    """ bounded lru cache of criteria parsed by to_criteria, size 0 turns caching off """
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    def __init__(self, size=1024):
+        self._size = size
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+        self._cache = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def get(self, key):
+        with self._lock:
+            obj = self._cache.pop(key, None)
+
+            if obj is None:
+                self._misses += 1
+
+            else:
+                self._hits += 1
+                self._cache[key] = obj
+
+            return obj
+
+    def put(self, key, obj):
+        with self._lock:
+            self._cache.pop(key, None)
+            self._cache[key] = obj
+            self._evict()
+
+    def resize(self, size):
+        with self._lock:
+            self._size = size
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def reset(self):
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+    def _evict(self):
+        while len(self._cache) > self._size:
+            self._cache.popitem(last=False)
+
+
+parse_cache = ParseCache()
+
+
+def profiled_class(cls, profile):
+    """ subclass of cls whose eval records its outcome and wall time to profile """
+    timer = timeit.default_timer
+
+    def eval(self, ctx):
+        started = timer()
+        try:
+            (obj, err) = cls.eval(self, ctx)
+
+        except Exception:
+            profile.record(self, None, None, timer() - started, True)
+            raise
+
+        profile.record(self, obj, err, timer() - started, False)
+        return obj, err
+
+    return type("Profiled%s" % cls.__name__, (cls,), {"__slots__": (), "eval": eval})
+
+
+class Profile(object):
+    """ per node tallies of evaluations. While started, criteria_class builds instrumented node classes, so only
+        criteria built in between are profiled and nothing is added to evaluation when not profiling. Instrumented
+        nodes override eval, so compile, filter, adaptive and vectorize evaluate them through their eval too """
+
+    names = ("calls", "true", "false", "unknown", "error", "exceptions", "seconds",)
+
+    keys = ("Bool", "Eq", "NotEq", "Between", "Gt", "GtE", "Lt", "LtE", "In", "NotIn", "And", "All", "Or", "Any", "Not",)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = dict()
+        self._classes = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        if self._classes is None:
+            self._classes = dict((key, criteria_class.lookup(key)) for key in Profile.keys)
+            for (key, cls) in self._classes.items():
+                criteria_class.override(key, profiled_class(cls, self))
+
+    def stop(self):
+        if self._classes is not None:
+            for (key, cls) in self._classes.items():
+                criteria_class.override(key, cls)
+
+            self._classes = None
+
+    def record(self, criteria, ans, err, seconds, raised):
+        with self._lock:
+            stats = self._stats.get(criteria, None)
+            if stats is None:
+                stats = self._stats[criteria] = [0, 0, 0, 0, 0, 0, 0.0]
+
+            stats[0] += 1
+            if raised:
+                stats[5] += 1
+
+            else:
+                stats[1 if ans in (True,) else 2 if ans in (False,) else 3 if ans == Const.UNKNOWN else 4] += 1
+                stats[5] += 0 if err is None else 1
+
+            stats[6] += seconds
+
+    def report(self):
+        """ calls, outcome tallies, exceptions and cumulative seconds, including children, keyed by str of the node """
+        report = dict()
+        with self._lock:
+            for (criteria, stats) in self._stats.items():
+                one = report.setdefault(str(criteria), dict((name, 0) for name in Profile.names))
+
+                for (name, value) in zip(Profile.names, stats):
+                    one[name] += value
+
+        return report
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+class Projection(object):
+    """ keys required by one or many criteria, and loaders keeping only those keys of each record, so records of
+        many fields are reduced to the few the criteria read. Criteria evaluate the same against the projection """
+
+    __slots__ = ("_keys",)
+
+    @property
+    def keys(self):
+        return self._keys
+
+    def __init__(self, *criteria):
+        self._keys = frozenset().union(*[one.required_keys() for one in criteria])
+
+    def __call__(self, obj):
+        """ dict of the required keys found on obj, looked up as ctx does, so only those attributes are fetched. Literal
+            keys which only fall back to their literal value are left out, the projection falls back the same """
+        (ctx, projected) = (criteria_class.instance(Const.Ctx, obj), dict())
+        for key in self._keys:
+            value = ctx.lookup(key)
+            if value is not missing and value is not literal_of(key):
+                projected[key] = value
+
+        return projected
+
+    def columns(self, header):
+        """ (key, position) of the required keys in header, keys not in header are left out """
+        positions = dict()
+        for (position, key) in enumerate(header):
+            positions.setdefault(key, position)
+
+        return [(key, positions[key]) for key in self._keys if key in positions]
+
+    def row(self, header, convert=None):
+        """ function of a row of values in header order to a dict of the required columns, values are passed
+            through convert when given, columns missing from a short row are left out """
+        columns = tuple(self.columns(header))
+        convert = convert or (lambda value: value)
+
+        def project(row):
+            size = len(row)
+            return dict([(key, convert(row[position])) for (key, position) in columns if position < size])
+
+        return project
+
+    def json(self, text):
+        """ dict of the required keys of a json object, other json values are returned as decoded """
+        import json
+        obj = json.loads(text)
+        return dict([(key, obj[key]) for key in self._keys if key in obj]) if isinstance(obj, dict) else obj
+
+
 operator_ser_symbol = Config({
     operator.eq: Const.eq_,
     operator.ne: Const.ne_,
@@ -904,8 +2955,13 @@ criteria_class = Config({
     Const.Any: Any,
     Const.Not: Not,
     Const.Ctx: Ctx,
+    Const.RowCtx: RowCtx,
+    Const.Evaluator: Evaluator,
     Const.Visitor: bEvalVisitor,
     Const.Universal: Universal,
+    Const.Compiled: Compiled,
+    Const.Adaptive: Adaptive,
+    Const.Projection: Projection,
 })
 
 
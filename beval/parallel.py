@@ -0,0 +1,194 @@
+import pickle
+import itertools
+import threading
+import collections
+import multiprocessing
+from beval.criteria import Compiled, to_criteria, matches, safe_monad, columns_size, masks_of
+
+try:
+    import numpy
+
+except ImportError:
+    numpy = None
+
+
+worker = dict()
+
+
+def criteria_of(payload):
+    (expr, pickled) = payload
+    return to_criteria(expr) if pickled is None else pickle.loads(pickled)
+
+
+def worker_init(payload, fuzzy, on_error):
+    """ pool initializer, the criteria is shipped once per worker as an expression or pickled """
+    worker.update(func=criteria_of(payload)._compile(), fuzzy=fuzzy, on_error=on_error)
+
+
+def worker_chunk(chunk):
+    """ positions of matched objs in chunk, and the error ending the chunk when on_error is raise """
+    positions = list()
+    try:
+        for (position, (_, matched)) in enumerate(matches(worker["func"], chunk, worker["fuzzy"], worker["on_error"])):
+            if matched:
+                positions.append(position)
+
+    except Exception as err:
+        (_, err_) = safe_monad(lambda: pickle.loads(pickle.dumps(err)))
+        return positions, err if err_ is None else RuntimeError(repr(err))
+
+    return positions, None
+
+
+def payload_of(criteria):
+    """ (expr, None) when str of criteria parses back to an equal criteria, (None, pickled) otherwise """
+    criteria = criteria.criteria if isinstance(criteria, Compiled) else criteria
+    try:
+        expr = str(criteria)
+        if to_criteria(expr) == criteria:
+            return expr, None
+
+    except Exception:
+        pass
+
+    return None, pickle.dumps(criteria, 2)
+
+
+def parallel_filter(criteria, iterable, workers, chunksize, fuzzy, on_error, ordered):
+    """ yield matched objs evaluated in a pool, at most two chunks per worker are in flight. Unordered, chunks are
+        handed over by the pool as they complete, and the generator blocks until one does """
+    workers = workers or multiprocessing.cpu_count()
+    pool = multiprocessing.Pool(workers, worker_init, (payload_of(criteria), fuzzy, on_error))
+    (iterator, pending) = (iter(iterable), collections.deque())
+    (finished, ready) = (collections.deque(), threading.Semaphore(0))
+
+    def finish(chunk):
+        """ callback of the pool, worker_chunk returns rather than raises so it is called for every chunk """
+        def callback(outcome):
+            finished.append((chunk, outcome))
+            ready.release()
+
+        return callback
+
+    try:
+        while True:
+            chunk = list(itertools.islice(iterator, chunksize))
+            if chunk:
+                pending.append((chunk, pool.apply_async(worker_chunk, (chunk,), callback=None if ordered else finish(chunk))))
+
+            while pending and (len(pending) >= workers * 2 or not chunk):
+                if ordered:
+                    (chunk_, result) = pending.popleft()
+                    (positions, err) = result.get()
+
+                else:
+                    ready.acquire()
+                    (chunk_, (positions, err)) = finished.popleft()
+                    pending.pop()
+
+                for position in positions:
+                    yield chunk_[position]
+
+                if err is not None:
+                    raise err
+
+            if not chunk:
+                break
+
+    finally:
+        pool.terminate()
+
+
+def shared_array(values):
+    """ RawArray holding a copy of values, and a numpy view of it """
+    raw = multiprocessing.RawArray("c", max(values.nbytes, 1))
+    view = numpy.frombuffer(raw, dtype=values.dtype, count=len(values))
+    view[:] = values
+    return raw, view
+
+
+def typed_column(values):
+    """ object columns of str only as a fixed width string array, which fits in shared memory """
+    if values.dtype == object and len(values) and all(type(one) is str for one in values):
+        typed = numpy.array(values.tolist())
+        if typed.dtype.kind in "SU" and typed.tolist() == values.tolist():
+            return typed
+
+    return values
+
+
+class SharedColumns(object):
+    """ columns copied once into shared memory, numeric and str columns are mapped by worker processes
+        without copying, columns of other objects are shipped once per worker """
+
+    @property
+    def size(self):
+        return self._size
+
+    def __init__(self, columns):
+        self._size = columns_size(columns)
+        (self._raw, self._views, self._objects) = (dict(), dict(), dict())
+
+        for key in columns:
+            values = typed_column(numpy.asarray(columns[key]))
+            if values.dtype == object:
+                self._objects[key] = values
+
+            else:
+                (self._raw[key], self._views[key]) = shared_array(values)
+
+    def __contains__(self, key):
+        return key in self._views or key in self._objects
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __getitem__(self, key):
+        return self._views[key] if key in self._views else self._objects[key]
+
+    def keys(self):
+        return list(self._views.keys()) + list(self._objects.keys())
+
+    def _shared(self):
+        """ what a worker needs to map the columns """
+        return self._raw, dict((key, view.dtype) for (key, view) in self._views.items()), self._objects, self._size
+
+
+def columns_worker_init(payload, fuzzy, shared, out):
+    (raw, dtypes, objects, size) = shared
+    columns = dict((key, numpy.frombuffer(raw[key], dtype=dtypes[key], count=size)) for key in raw)
+    columns.update(objects)
+    worker.update(criteria=criteria_of(payload), fuzzy=fuzzy, columns=columns,
+                  out=[numpy.frombuffer(one, dtype=bool, count=size) for one in out])
+
+
+def columns_worker_range(start, stop):
+    """ vectorize rows start to stop, writing the (ans, bad) masks to shared memory """
+    columns = dict((key, values[start:stop]) for (key, values) in worker["columns"].items())
+    with numpy.errstate(all="ignore"):
+        (ans, bad) = worker["criteria"]._vectorize(columns, stop - start, worker["fuzzy"])
+
+    (ans_, bad_) = worker["out"]
+    (ans_[start:stop], bad_[start:stop]) = (ans, bad)
+
+
+def parallel_vectorize(criteria, columns, fuzzy, workers, chunksize):
+    shared = columns if isinstance(columns, SharedColumns) else SharedColumns(columns)
+    size = shared.size
+    if size == 0:
+        return criteria.vectorize(shared, fuzzy)
+
+    workers = workers or multiprocessing.cpu_count()
+    chunksize = chunksize or -(-size // (workers * 4))
+    out = [multiprocessing.RawArray("c", size) for _ in range(2)]
+    pool = multiprocessing.Pool(workers, columns_worker_init, (payload_of(criteria), fuzzy, shared._shared(), out))
+
+    try:
+        for result in [pool.apply_async(columns_worker_range, (start, min(start + chunksize, size)))
+                       for start in range(0, size, chunksize)]:
+            result.get()
+
+    finally:
+        pool.terminate()
+
+    return masks_of(numpy.frombuffer(out[0], dtype=bool, count=size), numpy.frombuffer(out[1], dtype=bool, count=size), fuzzy)
@@ -0,0 +1,86 @@
+import csv
+import itertools
+from beval.criteria import Const, criteria_class, matches, safe_monad, csv_value
+
+
+def buffered_chunks(stream, buffersize):
+    """ lists of lines of stream, each read in one call of about buffersize bytes """
+    return iter(lambda: stream.readlines(buffersize), [])
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    return iter(lambda: list(itertools.islice(iterator, size)), [])
+
+
+class DecodeFailure(object):
+    """ stands for a record which failed to decode, with the error raised decoding it """
+
+    __slots__ = ("err",)
+
+    def __init__(self, err):
+        self.err = err
+
+
+def decode_or_failure(decode, one):
+    (obj, err) = safe_monad(decode, one)
+    return obj if err is None else DecodeFailure(err)
+
+
+def decoded_func(func):
+    """ compiled func to which a record failing to decode is UNKNOWN in fuzzy mode and ERROR in strict mode """
+    def fn(ctx, fuzzy):
+        if type(ctx.one) is DecodeFailure:
+            return Const.UNKNOWN if fuzzy else Const.ERROR, ctx.one.err
+
+        return func(ctx, fuzzy)
+
+    return fn
+
+
+def matched_chunks(criteria, chunks, decode, fuzzy, on_error, ctx=None):
+    """ yield the records of each chunk matched by criteria, each record is evaluated as decoded, or as is
+        when decode is None. on_error decides for records failing to decode as for those evaluated with errors,
+        with Const.raise_ the records matched before the failing one are yielded before the error is raised """
+    func = criteria._compile() if decode is None else decoded_func(criteria._compile())
+    for chunk in chunks:
+        (decoded, rows) = (chunk if decode is None else [decode_or_failure(decode, one) for one in chunk], [])
+        try:
+            for (position, (_, matched)) in enumerate(matches(func, decoded, fuzzy, on_error, ctx)):
+                if matched:
+                    rows.append(chunk[position])
+
+        except Exception as error:
+            yield rows
+            raise error
+
+        yield rows
+
+
+def csv_filter(criteria, source, sink, fuzzy, on_error, convert, buffersize, chunksize, dialect):
+    lines = (line for chunk in buffered_chunks(source, buffersize) for line in chunk)
+    reader = csv.reader(lines, dialect)
+    header = next(reader, None)
+    if header is None:
+        return 0
+
+    (writer, count) = (csv.writer(sink, dialect), 0)
+    writer.writerow(header)
+    ctx = criteria_class.instance(Const.RowCtx, header, criteria.required_keys(), fuzzy, convert)
+
+    for rows in matched_chunks(criteria, batches(reader, chunksize), None, fuzzy, on_error, ctx):
+        writer.writerows(rows)
+        count += len(rows)
+
+    return count
+
+
+def jsonl_filter(criteria, source, sink, fuzzy, on_error, buffersize):
+    (decode, count) = (criteria_class.instance(Const.Projection, criteria).json, 0)
+    chunks = ([line for line in chunk if line.strip()] for chunk in buffered_chunks(source, buffersize))
+
+    for lines in matched_chunks(criteria, chunks, decode, fuzzy, on_error):
+        sink.writelines(lines)
+        count += len(lines)
+
+    return count
@@ -0,0 +1,193 @@
+""" benchmarks for beval, run from the project root as PYTHONPATH=. python tests/benchmark.py [--records N] [--json] """
+import sys
+import json
+import timeit
+import argparse
+import platform
+import itertools
+from beval.criteria import Const, Criteria, to_criteria, set_mode, parse_cache
+from test_helper import CARS, CAR_DF, Car
+
+
+BENCHMARKS = list()
+
+
+EXPR = "17 <= maxprice < 21 and make in ('Chevrolet','Ford','Acura',) and type == 'Compact' and not (source == 'nonUSA')"
+
+
+FUZZY_EXPR = "cpu == 'Intel' or (17 <= maxprice < 21 and make in ('Chevrolet','Ford','Acura',) and type == 'Compact')"
+
+
+def benchmark(func):
+    BENCHMARKS.append(func)
+    return func
+
+
+def best_of(func, number, repeat=3):
+    """ best seconds per call of func """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def plain(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+DICTS = [{key: plain(value) for (key, value) in car.toDict().items()} for car in CARS]
+
+
+def records(kind, count):
+    """ count records cycling over the car fixture, as dicts or attribute objects """
+    return itertools.islice(itertools.cycle(DICTS if kind == "dicts" else CARS), count)
+
+
+def data_frame(count, columns):
+    """ count rows cycling over the car fixture, with lower cased column names """
+    df = CAR_DF.rename(columns=str.lower)[list(columns)]
+    return df.iloc[[i % len(df) for i in range(count)]].reset_index(drop=True)
+
+
+def throughput(func, count, repeat):
+    """ records per second of func consuming count records """
+    return count / best_of(func, 1, repeat)
+
+
+@benchmark
+def eval_mode(options):
+    """ seconds to evaluate against all cars, debug vs production mode vs compiled """
+    criteria = to_criteria(EXPR)
+    results = dict()
+
+    try:
+        for mode in (Const.debug, Const.production,):
+            set_mode(mode)
+            results[mode] = best_of(lambda: [criteria(car) for car in CARS], 50, options.repeat)
+
+    finally:
+        set_mode(Const.debug)
+
+    compiled = criteria.compile()
+    results["compiled"] = best_of(lambda: [compiled(car) for car in CARS], 50, options.repeat)
+    return results
+
+
+@benchmark
+def parse(options):
+    """ seconds per to_criteria, parsing with the cache cleared vs hitting the cache """
+    def cold():
+        parse_cache.clear()
+        to_criteria(EXPR)
+
+    return {"cold": best_of(cold, 200, options.repeat), "cached": best_of(lambda: to_criteria(EXPR), 2000, options.repeat)}
+
+
+@benchmark
+def eval_latency(options):
+    """ seconds per evaluation of one record, interpreted vs compiled vs evaluator reusing a ctx, dicts vs attribute objects """
+    (criteria, results) = (to_criteria(EXPR), dict())
+    for kind in ("dicts", "objects",):
+        objs = list(records(kind, len(CARS)))
+        for (name, func) in (("eval", criteria), ("compiled", criteria.compile()), ("evaluator", criteria.evaluator()),):
+            results["%s.%s" % (name, kind)] = best_of(lambda: [func(obj) for obj in objs], 20, options.repeat) / len(objs)
+
+    return results
+
+
+@benchmark
+def filter_throughput(options):
+    """ records per second of the batch filter over dicts and attribute objects, and of vectorize over a DataFrame """
+    (criteria, count, results) = (to_criteria(EXPR), options.records, dict())
+    for kind in ("dicts", "objects",):
+        results[kind] = throughput(lambda: sum(1 for _ in criteria.filter(records(kind, count))), count, options.repeat)
+
+    df = data_frame(count, ("maxprice", "make", "type", "source",))
+    results["dataframe"] = throughput(lambda: criteria.vectorize(df), count, options.repeat)
+    return results
+
+
+@benchmark
+def fuzzy_vs_strict(options):
+    """ records per second of the batch filter in strict and fuzzy mode, with a key missing from every record """
+    (criteria, count) = (to_criteria(FUZZY_EXPR), options.records)
+    return {
+        "strict": throughput(lambda: sum(1 for _ in criteria.filter(records("dicts", count))), count, options.repeat),
+        "fuzzy": throughput(lambda: sum(1 for _ in criteria.filter(records("dicts", count), fuzzy=True)), count, options.repeat),
+    }
+
+
+@benchmark
+def large_in(options):
+    """ seconds per evaluation of one record against in lists of growing size, the make is at the end or absent """
+    results = dict()
+    for size in (10, 1000, 100000,):
+        makes = ["Make%s" % i for i in range(size)] + ["Acura"]
+        criteria = to_criteria("make in (%s,)" % ",".join("'%s'" % make for make in makes)).compile()
+        results[str(size)] = best_of(lambda: [criteria(obj) for obj in DICTS], 20, options.repeat) / len(DICTS)
+
+    return results
+
+
+def deep_size(obj, seen=None):
+    """ bytes of obj and everything it holds, counting shared objects once """
+    seen = set() if seen is None else seen
+    if id(obj) in seen or obj is None or isinstance(obj, (bool, type)) or (callable(obj) and not isinstance(obj, Criteria)):
+        return 0
+
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for (k, v) in obj.items())
+
+    elif isinstance(obj, (tuple, list, set, frozenset)):
+        size += sum(deep_size(one, seen) for one in obj)
+
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            size += deep_size(getattr(obj, name, None), seen)
+
+    if hasattr(obj, "__dict__"):
+        size += deep_size(obj.__dict__, seen)
+
+    return size
+
+
+@benchmark
+def memory_per_rule(options):
+    """ bytes held per parsed rule """
+    count = 1000
+    rules = [to_criteria("make == 'Acura%s' and 17 <= maxprice < %s and type in ('Small','Compact',) and not (source == 'USA')" %
+                         (i, i)) for i in range(count)]
+    return {"bytes": sum(deep_size(rule) for rule in rules) / float(count)}
+
+
+def run(options):
+    results = dict()
+    for func in BENCHMARKS:
+        if not options.only or func.__name__ in options.only:
+            for (name, value) in func(options).items():
+                results["%s.%s" % (func.__name__, name)] = value
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="beval benchmarks")
+    parser.add_argument("--records", type=int, default=1000000, help="records for the throughput benchmarks")
+    parser.add_argument("--repeat", type=int, default=3, help="repeats, the best one is reported")
+    parser.add_argument("--only", nargs="*", default=[], help="names of the benchmarks to run")
+    parser.add_argument("--json", action="store_true", help="print one json document instead of lines of name value")
+    options = parser.parse_args(argv)
+
+    results = run(options)
+    if options.json:
+        meta = {"python": platform.python_version(), "platform": platform.platform(), "records": options.records,
+                "repeat": options.repeat}
+        print(json.dumps({"meta": meta, "results": results}, indent=2, sort_keys=True))
+
+    else:
+        for (name, value) in sorted(results.items()):
+            print("%s %.9f" % (name, value))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import random
+import unittest
+from unittest import TestCase
+from beval.criteria import Adaptive, Compiled, Const, Ctx, criteria_class, to_criteria, All, Any, Eq
+from test_helper import acura_small as acura, CompareError, CARS
+from test_compile import EXPRESSIONS
+from test_optimize import random_criteria, random_obj
+from test_rule_network import CountingCtx
+
+
+class TestAdaptive(TestCase):
+
+    def count_lookups(self, criteria, objs, fuzzy):
+        criteria_class.override(Const.Ctx, CountingCtx)
+        try:
+            del CountingCtx.lookups[:]
+            for obj in objs:
+                criteria(obj, fuzzy)
+
+            return {key: CountingCtx.lookups.count(key) for key in set(CountingCtx.lookups)}
+
+        finally:
+            criteria_class.override(Const.Ctx, Ctx)
+
+    def test_adaptive(self):
+        c = to_criteria("make == 'Acura' and type == 'Small'")
+        a = c.adaptive(period=16)
+        self.assertIsInstance(a, Adaptive)
+        self.assertIsInstance(a, Compiled)
+        self.assertIs(a.compile(), a)
+        self.assertIs(a.adaptive(period=16), a)
+        self.assertNotEqual(a, c.adaptive(period=32))
+        self.assertEqual(str(a), str(c))
+        self.assertEqual(a(acura), (True, None))
+
+    def test_strict_keeps_order(self):
+        for expr in EXPRESSIONS:
+            (c, a) = (to_criteria(expr), to_criteria(expr).adaptive(period=3))
+            for _ in range(3):
+                for car in CARS:
+                    self.assertEqual(c(car)[0], a(car)[0])
+                    self.assertEqual(type(c(car)[1]), type(a(car)[1]))
+
+        with acura:
+            acura.set_compare_error("make", CompareError(Exception("left first")))
+            acura.set_access_error("maxprice", KeyError)
+            for expr in EXPRESSIONS:
+                (c, a) = (to_criteria(expr), to_criteria(expr).adaptive(period=1))
+                for _ in range(4):
+                    self.assertEqual(c(acura)[0], a(acura)[0])
+                    self.assertIs(c(acura)[1].__class__, a(acura)[1].__class__)
+
+    def test_fuzzy_same_answers(self):
+        rnd = random.Random(5)
+        objs = [random_obj(rnd) for _ in range(40)]
+        for _ in range(200):
+            c = random_criteria(rnd, 4)
+            any_order = rnd.random() < 0.5
+            a = c.adaptive(period=3, any_order=any_order)
+            for _ in range(3):
+                for obj in objs:
+                    ((ans, err), (ans_, err_)) = (c(obj, True), a(obj, True))
+                    self.assertEqual(ans, ans_)
+                    if not any_order:
+                        self.assertEqual((type(err), str(err)), (type(err_), str(err_)))
+
+    def test_reorders(self):
+        objs = [{"a": 1, "b": 2}] * 1000
+        (c, n) = (All(Eq("a", 1), Eq("b", 1)), len(objs))
+
+        for fuzzy in (False, True,):
+            self.assertEqual(self.count_lookups(c.adaptive(period=16), objs, fuzzy), {"a": n, "b": n})
+            self.assertLess(self.count_lookups(c.adaptive(period=16, any_order=True), objs, fuzzy)["a"], 50)
+
+        self.assertIs(c.adaptive(period=16)._func.__code__, c._compile().__code__)
+
+        c = Any(Eq("b", 1), Eq("a", 1))
+        self.assertEqual(self.count_lookups(c.adaptive(period=16), objs, True), {"a": n, "b": n})
+        self.assertLess(self.count_lookups(c.adaptive(period=16, any_order=True), objs, True)["b"], 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from unittest import TestCase
+from beval.criteria import Const, Compiled, Ctx, ParseCache, SyntaxAstCallExtender, to_criteria, criteria_class, \
+    parse_cache, Eq, In
+
+
+class TestCache(TestCase):
+
+    def setUp(self):
+        parse_cache.clear()
+        parse_cache.reset()
+
+    def test_hit_miss(self):
+        expr = "make == 'Acura' and type == 'Small'"
+        c = to_criteria(expr)
+        self.assertEqual((parse_cache.hits, parse_cache.misses), (0, 1))
+
+        c2 = to_criteria(expr)
+        self.assertIs(c, c2)
+        self.assertEqual((parse_cache.hits, parse_cache.misses), (1, 1))
+
+        c3 = to_criteria(expr, compiled=True)
+        self.assertIsInstance(c3, Compiled)
+        self.assertIs(c3, to_criteria(expr, compiled=True))
+        self.assertEqual((parse_cache.hits, parse_cache.misses), (2, 2))
+
+        with self.assertRaises(SyntaxError):
+            to_criteria("make == ")
+        self.assertEqual(len(parse_cache), 2)
+
+    def test_lru_eviction(self):
+        cache = ParseCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+
+        cache.put("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+        cache.resize(1)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+        cache.resize(0)
+        cache.put("d", 4)
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get("d"))
+
+    def test_invalidate_on_override(self):
+        c = to_criteria("make == 'Acura'")
+        self.assertEqual(len(parse_cache), 1)
+
+        class Eq2(Eq):
+            pass
+
+        cls = criteria_class.lookup(Const.Eq)
+        criteria_class.override(Const.Eq, Eq2)
+        try:
+            self.assertEqual(len(parse_cache), 0)
+            c2 = to_criteria("make == 'Acura'")
+            self.assertIsInstance(c2, Eq2)
+            self.assertIsNot(c, c2)
+
+        finally:
+            criteria_class.override(Const.Eq, cls)
+
+        self.assertIsInstance(to_criteria("make == 'Acura'"), cls)
+
+    def test_invalidate_on_register(self):
+        class Version(object):
+
+            def __init__(self, value):
+                self.value = value
+
+        class VersionAstCallExtender(SyntaxAstCallExtender):
+
+            def name(self):
+                return "version"
+
+            def type(self):
+                return Version
+
+            def deserialize(self, *args, **kwargs):
+                return Version(*args, **kwargs)
+
+            def compare(self, ctx, key, op, left, right):
+                return op(left, right.value)
+
+        to_criteria("make == 'Acura'")
+        extender = VersionAstCallExtender()
+        SyntaxAstCallExtender.register(extender)
+        self.addCleanup(SyntaxAstCallExtender.unregister, extender)
+        self.assertEqual(len(parse_cache), 0)
+
+        c = to_criteria("v in (version(1),version(2),)")
+        self.assertIsInstance(c, In)
+        (ans, err) = c(Ctx({"v": 2}))
+        self.assertTrue(ans)
+        self.assertIsNone(err)
+
+
+if __name__ == '__main__':
+    unittest.main()
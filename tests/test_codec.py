@@ -0,0 +1,70 @@
+import pickle
+import unittest
+import operator
+import numpy as np
+from decimal import Decimal
+from unittest import TestCase
+from beval.criteria import Const, to_criteria, universal, Between, Bool, Eq, Gt, In, All, Any
+from beval.codec import to_bytes, from_bytes, codec_magic
+from test_helper import CARS
+from test_rule_index import EXPRESSIONS
+
+
+def within(left, right):
+    return abs(left - right) < 1
+
+
+class TestCodec(TestCase):
+
+    def assertRoundTrip(self, criteria):
+        for loaded in (from_bytes(to_bytes(criteria)), pickle.loads(pickle.dumps(criteria, pickle.HIGHEST_PROTOCOL))):
+            self.assertIsNot(loaded, criteria)
+            self.assertEqual(loaded, criteria)
+            self.assertEqual(str(loaded), str(criteria))
+            for fuzzy in (False, True,):
+                self.assertEqual([loaded(car, fuzzy)[0] for car in CARS], [criteria(car, fuzzy)[0] for car in CARS])
+
+    def test_round_trip(self):
+        for expr in EXPRESSIONS:
+            self.assertRoundTrip(to_criteria(expr))
+            self.assertRoundTrip(to_criteria(expr).compile())
+            self.assertRoundTrip(to_criteria(expr).adaptive(period=16))
+
+    def test_round_trip_values(self):
+        for criteria in (Eq("make", universal), In("make", "Acura", universal), Eq("mpgcity", 10 ** 20), Eq("make", u"Acura"),
+                         Eq("maxprice", 18.8, within), Between(17, "maxprice", 21, operator.lt, operator.le),
+                         Eq("make", ("Acura",)), All(), Any(), In("make")):
+            self.assertRoundTrip(criteria)
+
+    def test_round_trip_keys(self):
+        for key in (Decimal("3"), np.int64(3), np.float64(3.5)):
+            for criteria in (Eq(key, 2), Bool(key), In(key, 1, 3), Between(1, key, 4), Gt(key, 1)):
+                loaded = from_bytes(to_bytes(criteria))
+                self.assertEqual(loaded, criteria)
+                self.assertEqual(type(loaded.key), type(key))
+                self.assertEqual(loaded({}), criteria({}))
+
+    def test_many(self):
+        rules = [to_criteria(expr) for expr in EXPRESSIONS]
+        loaded = from_bytes(to_bytes(rules))
+        self.assertEqual(loaded, rules)
+
+        self.assertEqual(from_bytes(to_bytes([])), [])
+
+    def test_custom_op_kept(self):
+        criteria = from_bytes(to_bytes(Between(17, "maxprice", 21, within, within)))
+        self.assertIs(criteria.lower_op, within)
+        self.assertIs(criteria.upper_op, within)
+        self.assertEqual(criteria({"maxprice": 17.5}), (False, None))
+
+    def test_bad_data(self):
+        data = to_bytes(to_criteria("make == 'Acura'"))
+        with self.assertRaises(ValueError):
+            from_bytes(b"xyz" + data[len(codec_magic):])
+
+        with self.assertRaises(ValueError):
+            from_bytes(codec_magic + b"\xff" + data[len(codec_magic) + 1:])
+
+
+if __name__ == '__main__':
+    unittest.main()
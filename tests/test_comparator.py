@@ -0,0 +1,105 @@
+import unittest
+from unittest import TestCase
+from beval.criteria import SyntaxAstCallExtender, Const, Eq, Between, In
+
+
+class Version(object):
+
+    def __init__(self, text):
+        self.parts = tuple(int(one) for one in text.split("."))
+
+    def __str__(self):
+        return ".".join(str(one) for one in self.parts)
+
+
+class Release(Version):
+    pass
+
+
+class VersionAstCallExtender(SyntaxAstCallExtender):
+
+    def name(self):
+        return "version"
+
+    def type(self):
+        return Version
+
+    def deserialize(self, *args, **kwargs):
+        return Version(*args)
+
+    def compare(self, ctx, key, op, left, right):
+        (left, right) = [one if isinstance(one, Version) else Version(one) for one in (left, right)]
+        return op(left.parts, right.parts)
+
+
+class ReleaseAstCallExtender(VersionAstCallExtender):
+
+    def name(self):
+        return "release"
+
+    def type(self):
+        return Release
+
+    def compare(self, ctx, key, op, left, right):
+        raise ValueError("no release")
+
+
+class TestComparator(TestCase):
+
+    def setUp(self):
+        self.extenders = list()
+
+    def tearDown(self):
+        for extender in reversed(self.extenders):
+            SyntaxAstCallExtender.unregister(extender)
+
+    def register(self, extender):
+        self.extenders.append(extender)
+        SyntaxAstCallExtender.register(extender)
+
+    def test_subclass_dispatch(self):
+        self.assertIsNone(SyntaxAstCallExtender.find_comparator(Release))
+        self.register(VersionAstCallExtender())
+        self.assertIsNotNone(SyntaxAstCallExtender.find_comparator(Release))
+        self.assertIsNone(SyntaxAstCallExtender.find_comparator(str))
+
+        obj = {"version": "1.10"}
+        for criteria in (Eq("version", Release("1.10")), Between(Release("1.2"), "version", Release("1.11")),
+                         In("version", Release("0.9"), Release("1.10"))):
+            for func in (criteria, criteria.compile(),):
+                self.assertEqual(func(obj), (True, None))
+
+    def test_invalidated_on_register(self):
+        (eq, btw, in_) = (Eq("version", Release("1.0")), Between(Version("0.1"), "version", Release("2.0")),
+                          In("version", Release("1.0")))
+        obj = {"version": "1.0"}
+        self.assertEqual([eq(obj)[0], in_(obj)[0]], [False, False])
+
+        self.register(VersionAstCallExtender())
+        self.assertEqual([eq(obj)[0], btw(obj)[0], in_(obj)[0]], [True, True, True])
+
+        self.register(ReleaseAstCallExtender())
+        for criteria in (eq, btw, in_):
+            (ans, err) = criteria(obj)
+            self.assertEqual(ans, Const.ERROR)
+            self.assertIsInstance(err, ValueError)
+
+    def test_compiled_before_register(self):
+        criteria = (Eq("version", Release("1.0")), Between(Version("0.1"), "version", Release("2.0")),
+                    In("version", Release("1.0")))
+        funcs = [one.compile() for one in criteria] + [one.evaluator() for one in criteria]
+        obj = {"version": "1.0"}
+        self.assertEqual([func(obj)[0] for func in funcs[:1] + funcs[2:4] + funcs[5:]], [False] * 4)
+
+        self.register(VersionAstCallExtender())
+        self.assertEqual([func(obj) for func in funcs], [(True, None)] * 6)
+
+        self.register(ReleaseAstCallExtender())
+        for func in funcs:
+            (ans, err) = func(obj)
+            self.assertEqual(ans, Const.ERROR)
+            self.assertIsInstance(err, ValueError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+from unittest import TestCase
+from beval.criteria import Criteria, Compiled, Const, Ctx, RuleIndex, to_criteria, criteria_class, Eq, In, Between, Not, \
+    cTrue, cFalse
+from test_helper import acura_small as acura, CompareError, CARS
+
+
+EXPRESSIONS = (
+    "make == 'Acura'",
+    "make != 'Acura'",
+    "mpgcity > 25",
+    "mpgcity >= 25 and maxprice < 20",
+    "17 <= maxprice < 21 and make == 'Chevrolet' and type == 'Compact'",
+    "(17 <= maxprice < 21 and make == 'Chevrolet') or type == 'Compact'",
+    "make in ('Ford','Chrysler','Eagle','Honda','Acura','Mazda',)",
+    "make not in ('Ford','Chrysler','Eagle',)",
+    "not (make == 'Acura' or type == 'Small')",
+    "cpu == 'Intel' and make == 'Acura' and type == 'Small'",
+    "cpu == 'Intel' or make == 'Acura' or type == 'Small'",
+    "cpu in ('Intel','AMD',) or not (gpu == 'Nvidia')",
+    "make",
+    "True",
+    "'True' == True",
+    "1 in (4,3,2,1,0,)",
+)
+
+
+class TestCompile(TestCase):
+
+    def assertSame(self, criteria, compiled, obj):
+        for fuzzy in (False, True,):
+            (ans, err) = criteria(obj, fuzzy)
+            (ans_, err_) = compiled(obj, fuzzy)
+            self.assertEqual(ans, ans_)
+            self.assertEqual(type(err), type(err_))
+
+    def test_compile_simple(self):
+        c = Eq("make", "Acura").compile()
+        self.assertIsInstance(c, Compiled)
+        self.assertIs(c.compile(), c)
+        self.assertEqual(str(c), "make == 'Acura'")
+
+        (ans, err) = c(acura)
+        self.assertTrue(ans)
+        self.assertIsNone(err)
+
+        (ans, err) = c.eval(Ctx(acura))
+        self.assertTrue(ans)
+        self.assertIsNone(err)
+
+        (ans, err) = Not(cTrue).compile()(Ctx({}))
+        self.assertFalse(ans)
+        self.assertIsNone(err)
+
+        (ans, err) = Not(cFalse).compile()(Ctx({}))
+        self.assertTrue(ans)
+        self.assertIsNone(err)
+
+    def test_to_criteria_compiled(self):
+        c = to_criteria("make == 'Acura' and type == 'Small'", compiled=True)
+        self.assertIsInstance(c, Compiled)
+        self.assertEqual(str(c), "(make == 'Acura' and type == 'Small')")
+
+        (ans, err) = c(acura)
+        self.assertTrue(ans)
+        self.assertIsNone(err)
+
+    def test_same_as_eval(self):
+        for expr in EXPRESSIONS:
+            criteria = to_criteria(expr)
+            compiled = criteria.compile()
+            for car in CARS:
+                self.assertSame(criteria, compiled, car)
+
+    def test_same_as_eval_with_errors(self):
+        with acura:
+            acura.set_compare_error("make", CompareError(Exception("left first")))
+            acura.set_access_error("maxprice", KeyError)
+
+            for expr in EXPRESSIONS:
+                criteria = to_criteria(expr)
+                self.assertSame(criteria, criteria.compile(), acura)
+
+        fuzzy = Criteria().Eq("x", "x").Eq("y", "y").Eq("make", "Acura").All().Done()
+        (ans, err) = fuzzy.compile()(acura, True)
+        self.assertTrue(ans)
+        self.assertIsInstance(err, KeyError)
+
+        (ans, err) = fuzzy.compile()(acura)
+        self.assertEqual(ans, Const.ERROR)
+        self.assertIsInstance(err, KeyError)
+
+    def test_overridden_class(self):
+        class CaseInsensitiveEq(Eq):
+
+            __slots__ = ()
+
+            def eval(self, ctx):
+                (obj, err) = self._access(ctx)
+                return (obj.lower() == self.right.lower(), None) if err is None else (Const.ERROR, err)
+
+        cls = criteria_class.lookup(Const.Eq)
+        criteria_class.override(Const.Eq, CaseInsensitiveEq)
+        try:
+            c = to_criteria("make == 'ACURA' and not (type == 'midsize')")
+
+        finally:
+            criteria_class.override(Const.Eq, cls)
+
+        objs = [{"make": "acura", "type": "Small"}, {"make": "Acura", "type": "Midsize"}, {"make": "Ford", "type": "Small"}]
+        self.assertEqual([c(obj) for obj in objs], [(True, None), (False, None), (False, None)])
+        self.assertEqual([c.compile()(obj) for obj in objs], [c(obj) for obj in objs])
+        self.assertEqual([c.adaptive(period=1)(obj) for obj in objs], [c(obj) for obj in objs])
+        self.assertEqual([c.evaluator()(obj) for obj in objs], [c(obj) for obj in objs])
+        self.assertEqual(list(c.filter(objs)), objs[:1])
+        self.assertEqual([RuleIndex([c]).match(obj) for obj in objs], [[c], [], []])
+
+    def test_overridden_compare(self):
+        class AnyCompare(object):
+
+            __slots__ = ()
+
+            def compare(self, ctx, key, op, left, right):
+                return True, None
+
+        obj = {"make": "Ford", "mpgcity": 30}
+        for (cls, args) in ((Eq, ("make", "Acura")), (In, ("make", "Acura", "Honda")), (Between, (1, "mpgcity", 2))):
+            c = type("Any%s" % cls.__name__, (AnyCompare, cls), {"__slots__": ()})(*args)
+            for func in (c, c.compile(), c.evaluator()):
+                self.assertEqual(func(obj), (True, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
+import sys
+import pickle
 import unittest
+import subprocess
 from unittest import TestCase
-from beval.criteria import Criteria, Const, Ctx, to_criteria, And, Eq
+from beval.criteria import Criteria, Builder, Const, Ctx, to_criteria, And, Eq
 from test_helper import acura_midsize as acura, chevrolet_compact_e, chevrolet_compact_c, CARS
 
 
@@ -11,6 +14,40 @@ class TestCriteria(TestCase):
         with self.assertRaises(SyntaxError):
             Criteria().Done()
 
+    def test_compact_nodes(self):
+        self.assertIsInstance(Criteria(), Builder)
+        self.assertIsInstance(Criteria(), Criteria)
+
+        c = to_criteria("make == 'Acura' and 17 <= maxprice < 21 and type in ('Small',) and not (active)")
+        for node in (c, c.many[0], c.many[1], c.many[2], c.many[3], c.many[3].one):
+            self.assertFalse(hasattr(node, "__dict__"))
+            self.assertFalse(hasattr(node, "_stack"))
+
+    def test_stack_keyword(self):
+        class Odd(Criteria):
+
+            def __init__(self):
+                super(Odd, self).__init__(stack=False)
+
+            def eval(self, ctx):
+                return ctx["mpgcity"] % 2 == 1, None
+
+        self.assertEqual(Odd()({"mpgcity": 25}), (True, None))
+        self.assertEqual(Odd().compile()({"mpgcity": 24}), (False, None))
+
+    def test_pickle_nodes(self):
+        for expr in ("make == 'Acura' and 17 <= maxprice < 21 and type in ('Small',) and not (active)",
+                     "make != 'Acura' or mpgcity > 25 or True or make not in ('Ford',)"):
+            c = to_criteria(expr)
+            for one in (c, c.compile()):
+                loaded = pickle.loads(pickle.dumps(one, pickle.HIGHEST_PROTOCOL))
+                self.assertEqual(str(loaded), str(one))
+                self.assertEqual([loaded(car)[0] for car in CARS], [one(car)[0] for car in CARS])
+
+    def test_light_import(self):
+        script = "import sys, beval.criteria; print(sorted(set(['multiprocessing', 'csv', 'json']) & set(sys.modules)))"
+        self.assertEqual(subprocess.check_output([sys.executable, "-c", script]).strip(), b"[]")
+
     def test_criteria_simple(self):
         c = Criteria()
         self.assertEqual(c.size(), 0)
@@ -120,6 +157,50 @@ class TestCriteria(TestCase):
         potential = filter(predicate, CARS)
         self.assertEqual(len(potential), 2)
 
+    def test_no_exceptions_for_missing_keys(self):
+        raised = list()
+
+        def trace(frame, event, arg):
+            if event == "exception":
+                raised.append(arg)
+            return trace
+
+        car_search_criteria = to_criteria("cpu == 'Intel' and make == 'Acura' and 17 <= maxprice < 21 and "
+                                          "not (gpu in ('Nvidia','AMD',)) and turbo")
+        cars = [{"make": "Acura", "maxprice": 18}, {"make": "Ford"}, {}]
+        for criteria in (car_search_criteria, car_search_criteria.compile()):
+            for fuzzy in (True, False):
+                expected = [criteria(car, fuzzy) for car in cars]
+
+                sys.settrace(trace)
+                try:
+                    outcomes = [criteria(car, fuzzy) for car in cars]
+
+                finally:
+                    sys.settrace(None)
+
+                self.assertEqual(raised, [])
+                self.assertEqual([ans for (ans, _) in outcomes], [ans for (ans, _) in expected])
+                self.assertTrue(all(isinstance(err, KeyError) for (_, err) in outcomes))
+
+    def test_errors_not_shared(self):
+        for criteria in (to_criteria("turbo"), to_criteria("make == 'Acura'"), to_criteria("17 <= maxprice < 21"),
+                         to_criteria("gpu in ('Nvidia','AMD',)")):
+            for one in (criteria, criteria.compile()):
+                (_, err) = one({})
+                (_, err_) = one({})
+                self.assertIsInstance(err, KeyError)
+                self.assertIsNot(err, err_)
+                self.assertEqual(str(err), str(err_))
+
+        with self.assertRaises(KeyError) as raised:
+            list(to_criteria("turbo").filter([{}], on_error=Const.raise_))
+
+        with self.assertRaises(KeyError) as raised_:
+            list(to_criteria("turbo").filter([{}], on_error=Const.raise_))
+
+        self.assertIsNot(raised.exception, raised_.exception)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,53 @@
 import unittest
+import collections
 from unittest import TestCase
-from beval.criteria import Const, Ctx, Eq, criteria_class
-from test_helper import acura_small
+from beval.criteria import Const, Ctx, RowCtx, Eq, RuleIndex, RuleNetwork, criteria_class, safe_monad, dict_accessor, \
+    item_accessor, attribute_accessor, resolve_accessor, literal_of, missing, to_criteria
+from test_helper import acura_small, CARS, CAR_DIMENSIONS
+from test_rule_index import EXPRESSIONS
+
+
+class Truck(object):
+
+    def __init__(self, make, wheels=None):
+        self.make = make
+        if wheels is not None:
+            self.wheels = wheels
+
+    @property
+    def type(self):
+        return "Truck"
+
+    @property
+    def broken(self):
+        raise AttributeError("broken")
+
+    def drivetrain(self):
+        return "All"
+
+
+def resolve(ctx, key):
+    """ reference resolution of key, without accessor strategies """
+    one = ctx.one
+    if hasattr(one, "__getitem__") and key in one:
+        return one[key]
+
+    elif isinstance(key, str) and hasattr(one, key):
+        obj = getattr(one, key)
+        return obj() if callable(obj) else obj
+
+    elif isinstance(key, str) and hasattr(ctx, key):
+        obj = getattr(ctx, key)
+        return obj() if callable(obj) else obj
+
+    else:
+        raise KeyError("cannot find key '%s'" % key)
+
+
+class Van:
+
+    def __init__(self, make):
+        self.make = make
 
 
 class TestCtx(TestCase):
@@ -57,6 +103,152 @@ class TestCtx(TestCase):
         """ restore the original ctx impl cls """
         criteria_class.override(Const.Ctx, cls)
 
+    def test_accessor_strategies(self):
+        Ctx({"make": "Acura"})["make"]
+        Ctx(collections.OrderedDict(make="Acura"))["make"]
+        Ctx(Truck("Ford"))["make"]
+        Ctx(Truck("Ford"))["type"]
+
+        self.assertIs(Ctx.accessors[(dict, "make")], dict_accessor)
+        self.assertIs(Ctx.accessors[(collections.OrderedDict, "make")], item_accessor)
+        self.assertIs(Ctx.accessors[(Truck, "make")], attribute_accessor)
+        self.assertIsNot(Ctx.accessors[(Truck, "type")], attribute_accessor)
+
+        Ctx(Truck("Ford"))[1]
+        self.assertIs(Ctx.accessors[(Truck, 1)], resolve_accessor)
+
+    def test_accessors_bounded(self):
+        saved = dict(Ctx.accessors)
+        try:
+            Ctx.accessors.update(((dict, ("filler", i)), dict_accessor) for i in range(65536 - len(Ctx.accessors)))
+            self.assertEqual(Ctx({"model": "Integra"})["model"], "Integra")
+            self.assertEqual(len(Ctx.accessors), 65536)
+            self.assertNotIn((dict, "model"), Ctx.accessors)
+
+        finally:
+            Ctx.accessors.clear()
+            Ctx.accessors.update(saved)
+
+    def test_accessor_same_as_resolve(self):
+        objs = [{"make": "Acura", "wheels": 4}, {"wheels": 6}, {1: "one", "True": "yes"}, {}, collections.OrderedDict(make="Acura"),
+                Truck("Ford", 4), Truck("Dodge"), Van("Mazda"), Van("Honda"), acura_small, CARS[1]]
+        keys = ["make", "wheels", "type", "drivetrain", "broken", "keys", "fuzzy", "cpu", "maxprice", 1, True, "True", "'True'"]
+
+        for fuzzy in (True, False):
+            for key in keys:
+                for obj in objs:
+                    ctx = Ctx(obj, fuzzy)
+                    (obj_, err_) = safe_monad(resolve, ctx, key)
+                    (obj2_, err2_) = safe_monad(ctx.key, key)
+                    self.assertEqual(type(err_), type(err2_))
+                    if key != "keys":
+                        self.assertEqual(obj_, obj2_)
+
+                    obj3_ = ctx.lookup(key)
+                    if err_ is None and key != "keys":
+                        self.assertEqual(obj_, obj3_)
+
+                    elif err_ is not None:
+                        self.assertEqual(obj3_, literal_of(key))
+
+    def test_lookup_missing(self):
+        ctx = Ctx({"make": "Acura"})
+        self.assertEqual(ctx.lookup("make"), "Acura")
+        self.assertIs(ctx.lookup("cpu"), missing)
+        self.assertEqual(ctx.lookup("'cpu'"), "cpu")
+        self.assertEqual(ctx.lookup(1), 1)
+
+        with acura_small as acura:
+            acura.set_access_error("make", ValueError("no make"))
+            self.assertIs(Ctx(acura).lookup("make"), missing)
+
+            with self.assertRaises(KeyError):
+                Ctx(acura)["make"]
+
+        class Ctx2(Ctx):
+            def key(self, key, *args, **kwargs):
+                return "override"
+
+        self.assertEqual(Ctx2({}).lookup("make"), "override")
+
+    def test_overridden_getitem(self):
+        class LowerCtx(Ctx):
+            def __getitem__(self, key, *args, **kwargs):
+                return super(LowerCtx, self).__getitem__(key.lower(), *args, **kwargs)
+
+        self.assertEqual(LowerCtx({"make": "Acura"}).lookup("MAKE"), "Acura")
+        self.assertIs(LowerCtx({"make": "Acura"}).lookup("CPU"), missing)
+
+        criteria_class.override(Const.Ctx, LowerCtx)
+        try:
+            c = Eq("MAKE", "Acura")
+            for func in (c, c.compile(), c.evaluator()):
+                self.assertEqual(func({"make": "Acura"}), (True, None))
+
+        finally:
+            criteria_class.override(Const.Ctx, Ctx)
+
+    def test_rebind(self):
+        ctx = Ctx({"make": "Acura"})
+        self.assertEqual(ctx["make"], "Acura")
+        self.assertIs(ctx.rebind(Truck("Ford")), ctx)
+        self.assertEqual(ctx["make"], "Ford")
+        self.assertEqual(ctx["drivetrain"], "All")
+
+    def test_row_ctx(self):
+        ctx = RowCtx(("make", "type", "make", "maxprice",), fuzzy=True)
+        self.assertEqual(ctx.header, ("make", "type", "make", "maxprice",))
+        self.assertTrue(ctx.fuzzy)
+
+        row = ("Acura", "Small", "Ford", 18.8)
+        self.assertIs(ctx.rebind(row), ctx)
+        self.assertIs(ctx.one, row)
+        self.assertEqual((ctx["make"], ctx["maxprice"], ctx.lookup("'cpu'"), ctx.lookup(1)), ("Acura", 18.8, "cpu", 1))
+        self.assertIs(ctx.lookup("cpu"), missing)
+        self.assertEqual(ctx.get("cpu", default="Intel"), "Intel")
+
+        with self.assertRaises(KeyError):
+            ctx["cpu"]
+
+        ctx.rebind(("Ford",))
+        self.assertIs(ctx.lookup("type"), missing)
+
+        ctx = RowCtx(("make", "type", "maxprice",), keys=frozenset(["maxprice"]), convert=float).rebind(("Acura", "Small", "18.8"))
+        self.assertEqual(ctx["maxprice"], 18.8)
+        self.assertIs(ctx.lookup("make"), missing)
+
+        ctx.bind(("maxprice",)).rebind(("21",))
+        self.assertEqual(ctx["maxprice"], 21.0)
+
+        ctx.rebind(("NA",))
+        self.assertIs(ctx.lookup("maxprice"), missing)
+        with self.assertRaises(KeyError):
+            ctx["maxprice"]
+
+        for criteria in (to_criteria("maxprice < 20"), to_criteria("maxprice < 20").compile()):
+            self.assertEqual(criteria(ctx.rebind(("NA",)))[0], Const.ERROR)
+            self.assertIsInstance(criteria(ctx)[1], KeyError)
+            self.assertEqual(criteria(ctx.rebind(("18.8",)))[0], True)
+
+    def test_row_ctx_same_as_dict(self):
+        rows = [tuple(car.toDict()[key] for key in CAR_DIMENSIONS) for car in CARS]
+        rules = [to_criteria(expr) for expr in EXPRESSIONS]
+
+        for fuzzy in (False, True,):
+            ctx = RowCtx(CAR_DIMENSIONS, fuzzy=fuzzy)
+            for rule in rules:
+                compiled = rule.compile()
+                for row in rows:
+                    expected = rule(dict(zip(CAR_DIMENSIONS, row)), fuzzy)[0]
+                    self.assertEqual(rule(ctx.rebind(row))[0], expected)
+                    self.assertEqual(compiled(ctx)[0], expected)
+
+            (index, network) = (RuleIndex(rules), RuleNetwork(rules))
+            for row in rows:
+                expected = [rule for rule in rules if rule(dict(zip(CAR_DIMENSIONS, row)), fuzzy)[0] is True]
+                self.assertEqual(index.match(ctx.rebind(row), fuzzy), expected)
+                self.assertEqual(network.match(ctx, fuzzy), expected)
+
 
 if __name__ == '__main__':
     unittest.main()
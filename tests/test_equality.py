@@ -0,0 +1,75 @@
+import unittest
+import operator
+from unittest import TestCase
+from beval.criteria import Criteria, to_criteria, universal, All, And, Between, Eq, NotEq, In, NotIn, Not, Bool
+
+
+class Version(object):
+
+    def __init__(self, text):
+        self.text = text
+
+    def __str__(self):
+        return "'1.0'"
+
+
+class TestEquality(TestCase):
+
+    def assertSame(self, left, right):
+        self.assertIsNot(left, right)
+        self.assertEqual(left, right)
+        self.assertFalse(left != right)
+        self.assertEqual(hash(left), hash(right))
+
+    def assertDifferent(self, left, right):
+        self.assertNotEqual(left, right)
+        self.assertFalse(left == right)
+
+    def test_structurally_equal(self):
+        self.assertSame(to_criteria("make == 'Acura' and type == 'Small'"), to_criteria("make=='Acura' and type=='Small'"))
+        self.assertSame(to_criteria("17 <= maxprice < 21 or not (make in ('Ford','Acura',))"),
+                        to_criteria("17<=maxprice<21 or not (make in ('Ford','Acura',))"))
+        self.assertSame(Criteria().Eq("make", "Acura").Bool("manual").And().Done(), And(Eq("make", "Acura"), Bool("manual")))
+        self.assertSame(In("make", universal), In("make", universal.__class__()))
+        self.assertSame(Eq("x", float("nan")), Eq("x", float("nan")))
+        self.assertSame(to_criteria("make == 'Acura'").compile(), Eq("make", "Acura").compile())
+
+    def test_structurally_different(self):
+        self.assertDifferent(Eq("x", 1), Eq("x", True))
+        self.assertDifferent(Eq("x", 1), Eq("x", 1.0))
+        self.assertDifferent(Eq("x", 1), NotEq("x", 1))
+        self.assertDifferent(Eq("x", 1), Eq("x", 1, operator.lt))
+        self.assertDifferent(In("x", 1, 2), In("x", 2, 1))
+        self.assertDifferent(In("x", 1, 2), NotIn("x", 1, 2))
+        self.assertDifferent(In("x", universal), In("x", "a"))
+        self.assertDifferent(Between(1, "x", 2), Between(1, "x", 2, upper_op=operator.le))
+        self.assertDifferent(All(Eq("x", 1), Eq("y", 1)), And(Eq("x", 1), Eq("y", 1)))
+        self.assertDifferent(All(Eq("x", 1), Eq("y", 1)), All(Eq("y", 1), Eq("x", 1)))
+        self.assertDifferent(Not(Eq("x", 1)), Eq("x", 1))
+        self.assertDifferent(Eq("x", 1), "x == 1")
+        self.assertDifferent(Eq("x", 1).compile(), Eq("x", 1))
+
+    def test_extender_values(self):
+        (left, right) = (Version("1.0"), Version("1.0"))
+        self.assertEqual(str(Eq("v", left)), str(Eq("v", right)))
+        self.assertDifferent(Eq("v", left), Eq("v", right))
+        self.assertSame(Eq("v", left), Eq("v", left))
+
+        values = [1, 0]
+        self.assertSame(Eq("v", values), Eq("v", values))
+        self.assertDifferent(Eq("v", values), Eq("v", [1, 0]))
+
+    def test_hash_cached_and_dedupe(self):
+        c = to_criteria("make == 'Acura' and (type == 'Small' or mpgcity > 20)")
+        self.assertIsNone(c._hash)
+        h = hash(c)
+        self.assertEqual(c._hash, h)
+        self.assertEqual(c.many[1]._hash, hash(c.many[1]))
+
+        rules = [to_criteria("make == 'Acura'"), to_criteria("make=='Acura'"), to_criteria("make == 'Ford'"), Eq("make", "Acura")]
+        self.assertEqual(len(set(rules)), 2)
+        self.assertEqual({rules[0]: 1}[rules[3]], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
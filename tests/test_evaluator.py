@@ -0,0 +1,42 @@
+import unittest
+from unittest import TestCase
+from beval.criteria import Evaluator, Ctx, RowCtx, to_criteria
+from test_helper import CARS, CAR_DIMENSIONS
+from test_rule_index import EXPRESSIONS
+
+
+class TestEvaluator(TestCase):
+
+    def test_same_as_call(self):
+        for expr in EXPRESSIONS:
+            criteria = to_criteria(expr)
+            for fuzzy in (False, True,):
+                evaluate = criteria.evaluator(fuzzy)
+                self.assertIsInstance(evaluate, Evaluator)
+                self.assertIs(evaluate.criteria, criteria)
+                self.assertEqual(evaluate.fuzzy, fuzzy)
+
+                for car in CARS:
+                    (ans, err) = evaluate(car)
+                    (ans_, err_) = criteria(car, fuzzy)
+                    self.assertEqual(ans, ans_)
+                    self.assertEqual(type(err), type(err_))
+                    self.assertIs(evaluate.ctx.one, car)
+
+    def test_reused_ctx(self):
+        ctx = Ctx(None, True)
+        evaluate = to_criteria("cpu == 'Intel' or make == 'Acura'").evaluator(ctx=ctx)
+        self.assertIs(evaluate.ctx, ctx)
+        self.assertTrue(evaluate.fuzzy)
+        self.assertEqual([evaluate(car)[0] for car in CARS[:3]], [True, True, False])
+        self.assertIs(ctx.one, CARS[2])
+
+    def test_row_ctx(self):
+        criteria = to_criteria("17 <= maxprice < 21 and make in ('Chevrolet','Ford','Acura',)").adaptive(period=8)
+        evaluate = criteria.evaluator(ctx=RowCtx(CAR_DIMENSIONS, criteria.required_keys()))
+        rows = [tuple(car.toDict()[key] for key in CAR_DIMENSIONS) for car in CARS]
+        self.assertEqual([evaluate(row)[0] for row in rows], [criteria(car)[0] for car in CARS])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from unittest import TestCase
+from beval.criteria import Const, to_criteria
+from test_helper import CARS
+
+
+class TestFilter(TestCase):
+
+    def setUp(self):
+        self.cars = [{"make": "Subaru", "drivetrain": "All"}, {"make": "Acura", "drivetrain": "Front"},
+                     {"make": "Ford", "drivetrain": "Front"}, {"drivetrain": "Front"}]
+
+    def test_filter(self):
+        c = to_criteria("make == 'Acura' and drivetrain == 'Front'")
+        matched = c.filter(self.cars)
+        self.assertFalse(isinstance(matched, list))
+        self.assertEqual(list(matched), [self.cars[1]])
+        self.assertEqual(list(c.compile().filter(self.cars)), [self.cars[1]])
+
+        c = to_criteria("make == 'Ford' or drivetrain == 'Front'")
+        self.assertEqual(list(c.filter(self.cars)), self.cars[1:3])
+        self.assertEqual(list(c.filter(self.cars, fuzzy=True)), self.cars[1:])
+        self.assertEqual(list(c.filter(self.cars, on_error=Const.include)), self.cars[1:])
+
+        with self.assertRaises(KeyError):
+            list(c.filter(self.cars, on_error=Const.raise_))
+
+    def test_same_as_list_comprehension(self):
+        for expr in ("make == 'Chevrolet' and type == 'Compact' and source == 'USA'",
+                     "17 <= maxprice < 21 or cpu == 'Intel'",
+                     "make in ('Acura','Ford',) and not (type == 'Small')",):
+            c = to_criteria(expr)
+            for fuzzy in (False, True,):
+                expected = [car for car in CARS if True in c(car, fuzzy)]
+                self.assertEqual(list(c.filter(CARS, fuzzy)), expected)
+                self.assertEqual(c.count(CARS, fuzzy), len(expected))
+                self.assertEqual(c.first(CARS, fuzzy=fuzzy), expected[0] if expected else None)
+                self.assertEqual(c.exists(CARS, fuzzy), len(expected) > 0)
+
+                (positive, negative) = c.partition(CARS, fuzzy)
+                self.assertEqual(positive, expected)
+                self.assertEqual(len(positive) + len(negative), len(CARS))
+
+    def test_stop_early(self):
+        seen = list()
+
+        def cars():
+            for car in self.cars:
+                seen.append(car)
+                yield car
+
+        c = to_criteria("make == 'Acura'")
+        self.assertEqual(c.first(cars()), self.cars[1])
+        self.assertEqual(len(seen), 2)
+
+        del seen[:]
+        self.assertTrue(c.exists(cars()))
+        self.assertEqual(len(seen), 2)
+
+        del seen[:]
+        self.assertEqual(to_criteria("make == 'Mazda'").first(cars(), default="none"), "none")
+        self.assertEqual(len(seen), 4)
+
+    def test_partition_on_error(self):
+        c = to_criteria("make == 'Ford'")
+        (positive, negative) = c.partition(self.cars)
+        self.assertEqual(positive, [self.cars[2]])
+        self.assertEqual(negative, [self.cars[0], self.cars[1], self.cars[3]])
+
+        (positive, negative) = c.partition(self.cars, on_error=Const.include)
+        self.assertEqual(positive, [self.cars[2], self.cars[3]])
+
+        with self.assertRaises(KeyError):
+            c.partition(self.cars, on_error=Const.raise_)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,8 @@
 import unittest
 from unittest import TestCase
 
-from beval.criteria import Const, Ctx, In, to_criteria, universal
-from test_helper import acura_small
+from beval.criteria import Const, Ctx, In, NotIn, SyntaxAstCallExtender, to_criteria, universal
+from test_helper import acura_small, CompareError
 
 
 class TestIn(TestCase):
@@ -94,6 +94,108 @@ class TestIn(TestCase):
             self.assertTrue(ans)
             self.assertIsNone(err)
 
+    def test_in_large(self):
+        in_ = In("id", *range(10000))
+        not_in_ = NotIn("id", *range(10000))
+        for (value, expected) in ((9999, True), (0, True), (9999.0, True), (True, True), (-1, False), ("9999", False), (None, False)):
+            (ans, err) = in_({"id": value})
+            self.assertEqual(ans, expected)
+            self.assertIsNone(err)
+
+            (ans, err) = not_in_({"id": value})
+            self.assertEqual(ans, not expected)
+            self.assertIsNone(err)
+
+    def test_in_compare_error(self):
+        with acura_small as acura:
+            acura.set_compare_error("make", CompareError(Exception("left first")))
+            in_ = In("make", "Ford", "Acura")
+
+            (ans, err) = in_(Ctx(acura))
+            self.assertEqual(ans, Const.ERROR)
+            self.assertIsInstance(err, Exception)
+
+            (ans, err) = in_(Ctx(acura, True))
+            self.assertEqual(ans, Const.UNKNOWN)
+            self.assertIsInstance(err, Exception)
+
+    def test_in_mixed_candidates(self):
+        class Broken(object):
+
+            def __str__(self):
+                return "broken()"
+
+        class BrokenAstCallExtender(SyntaxAstCallExtender):
+
+            def name(self):
+                return "broken"
+
+            def type(self):
+                return Broken
+
+            def deserialize(self, *args, **kwargs):
+                return Broken()
+
+            def compare(self, ctx, key, op, left, right):
+                raise ValueError("broken")
+
+        extender = BrokenAstCallExtender()
+        SyntaxAstCallExtender.register(extender)
+        self.addCleanup(SyntaxAstCallExtender.unregister, extender)
+
+        in_ = to_criteria("make in ('Ford',broken(),'Acura',)")
+        (ans, err) = in_({"make": "Acura"})
+        self.assertEqual(ans, Const.ERROR)
+        self.assertIsInstance(err, ValueError)
+
+        (ans, err) = in_({"make": "Acura"}, True)
+        self.assertTrue(ans)
+        self.assertIsInstance(err, ValueError)
+
+        (ans, err) = in_({"make": "Mazda"}, True)
+        self.assertFalse(ans)
+        self.assertIsInstance(err, ValueError)
+
+        in_ = to_criteria("make in ('Acura',broken(),)")
+        (ans, err) = in_({"make": "Acura"})
+        self.assertTrue(ans)
+        self.assertIsNone(err)
+
+    def test_in_register_after_build(self):
+        class Upper(str):
+            pass
+
+        class UpperAstCallExtender(SyntaxAstCallExtender):
+
+            def name(self):
+                return "upper"
+
+            def type(self):
+                return str
+
+            def deserialize(self, *args, **kwargs):
+                return Upper(*args)
+
+            def compare(self, ctx, key, op, left, right):
+                return op(left.upper(), right.upper())
+
+        in_ = In("make", "ACURA")
+        (ans, err) = in_({"make": "acura"})
+        self.assertFalse(ans)
+
+        extender = UpperAstCallExtender()
+        SyntaxAstCallExtender.register(extender)
+        try:
+            (ans, err) = in_({"make": "acura"})
+            self.assertTrue(ans)
+            self.assertIsNone(err)
+
+        finally:
+            SyntaxAstCallExtender.unregister(extender)
+
+        (ans, err) = in_({"make": "acura"})
+        self.assertFalse(ans)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from unittest import TestCase
+from beval.criteria import Criteria, Const, All, Not, cTrue, to_criteria, set_mode, get_mode
+from test_helper import CARS
+
+
+class Broken(Criteria):
+
+    def __init__(self):
+        super(Broken, self).__init__()
+
+    def eval(self, ctx):
+        return "broken", None
+
+
+class TestMode(TestCase):
+
+    def tearDown(self):
+        set_mode(Const.debug)
+
+    def test_mode(self):
+        self.assertEqual(get_mode(), Const.debug)
+
+        set_mode(Const.production)
+        self.assertEqual(get_mode(), Const.production)
+
+        with self.assertRaises(ValueError):
+            set_mode("fast")
+        self.assertEqual(get_mode(), Const.production)
+
+    def test_assertion_only_in_debug(self):
+        for criteria in (Broken(), All(cTrue, Broken()), Not(Broken())):
+            with self.assertRaises(AssertionError):
+                criteria({})
+
+        set_mode(Const.production)
+        for criteria in (Broken(), All(cTrue, Broken()), Not(Broken())):
+            (ans, err) = criteria({})
+            self.assertEqual(ans, Const.ERROR if isinstance(criteria, All) else "broken")
+
+    def test_same_outcomes(self):
+        expressions = ("17 <= maxprice < 21 and make == 'Chevrolet' and type == 'Compact'",
+                       "cpu == 'Intel' or make in ('Acura','Ford',) or not (type == 'Small')",)
+        criteria = [to_criteria(expr) for expr in expressions]
+        expected = [[c(car, fuzzy) for car in CARS] for c in criteria for fuzzy in (False, True)]
+
+        set_mode(Const.production)
+        actual = [[c(car, fuzzy) for car in CARS] for c in criteria for fuzzy in (False, True)]
+        for (outcomes, outcomes_) in zip(expected, actual):
+            self.assertEqual([ans for (ans, _) in outcomes], [ans for (ans, _) in outcomes_])
+            self.assertEqual([type(err) for (_, err) in outcomes], [type(err) for (_, err) in outcomes_])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import random
+import unittest
+from unittest import TestCase
+from beval.criteria import Criteria, to_criteria, cTrue, cFalse, All, And, Any, Or, Not, Bool, Eq, NotEq, In, Lt, Gt, Between
+from test_helper import CompareError, CARS
+
+
+def nodes(criteria):
+    if isinstance(criteria, All):
+        return 1 + sum(nodes(one) for one in criteria.many)
+
+    elif isinstance(criteria, Not):
+        return 1 + nodes(criteria.one)
+
+    return 1
+
+
+def random_criteria(rnd, depth):
+    if depth == 0 or rnd.random() < 0.3:
+        (key, value) = (rnd.choice("abc"), rnd.choice([1, 2, "x", None, True]))
+        return rnd.choice([
+            lambda: Eq(key, value),
+            lambda: NotEq(key, value),
+            lambda: In(key, value, rnd.choice([1, 2, "x"])),
+            lambda: Lt(key, 2),
+            lambda: Between(0, key, 2),
+            lambda: Bool(key),
+            lambda: rnd.choice([cTrue, cFalse, Bool("True"), Bool("0"), Eq("1", 1), Bool("'x'")]),
+        ])()
+
+    many = [random_criteria(rnd, depth - 1) for _ in range(rnd.randint(0, 4))]
+    if len(many) == 2 and rnd.random() < 0.5:
+        return (And if rnd.random() < 0.5 else Or)(*many)
+
+    elif many and rnd.random() < 0.2:
+        return Not(many[0])
+
+    return (All if rnd.random() < 0.5 else Any)(*many)
+
+
+def random_obj(rnd):
+    values = [1, 2, "x", None, True, 0, CompareError(Exception("compare"))]
+    return {key: rnd.choice(values) for key in ("a", "b", "c", True, "1") if rnd.random() < (0.8 if key in ("a", "b", "c",) else 0.2)}
+
+
+class TestOptimize(TestCase):
+
+    def assertSameOutcomes(self, criteria, optimized, objs):
+        for fuzzy in (False, True,):
+            for obj in objs:
+                (ans, err) = criteria(obj, fuzzy)
+                (ans_, err_) = optimized(obj, fuzzy)
+                self.assertEqual(ans, ans_, "%s vs %s on %s" % (criteria, optimized, obj))
+                self.assertEqual((type(err), str(err)), (type(err_), str(err_)))
+
+    def test_flatten_and_dedupe(self):
+        c = to_criteria("make == 'Acura' and (type == 'Small' and (make == 'Acura' and mpgcity > 20))")
+        o = c.optimize()
+        self.assertEqual(o, All(Eq("make", "Acura"), Eq("type", "Small"), Gt("mpgcity", 20)))
+        self.assertLess(nodes(o), nodes(c))
+        self.assertSameOutcomes(c, o, CARS)
+
+    def test_literal_keys_not_folded(self):
+        self.assertIs(Not(Not(Eq("make", "Acura"))).optimize().__class__, Eq)
+        self.assertEqual(to_criteria("make == 'Acura' or True or type == 'Small'").optimize(),
+                         Any(Eq("make", "Acura"), cTrue, Eq("type", "Small")))
+        self.assertEqual(to_criteria("True and make == 'Acura' and True").optimize(), All(cTrue, Eq("make", "Acura")))
+
+        for c in (to_criteria("True and False"), to_criteria("not (1 == 1)"), All(Bool("'x'"), Eq("make", "Acura"))):
+            self.assertIs(c.optimize(), c)
+
+        c = to_criteria("make == 'Acura' or True")
+        self.assertSameOutcomes(c, c.optimize(), [{"make": "Ford"}, {"make": "Ford", True: False}])
+
+    def test_merge_eq_into_in(self):
+        c = to_criteria("make == 'Acura' or make == 'Ford' or make in ('Acura','Eagle',) or type == 'Small' or make == 'Honda'")
+        o = c.optimize()
+        self.assertEqual(o, Any(In("make", "Acura", "Ford", "Eagle"), Eq("type", "Small"), Eq("make", "Honda")))
+        self.assertSameOutcomes(c, o, CARS)
+
+    def test_unchanged(self):
+        for expr in ("make == 'Acura'", "make == 'Acura' and type == 'Small'", "not (make == 'Acura')"):
+            c = to_criteria(expr)
+            self.assertIs(c.optimize(), c)
+
+        for c in (All(), Any()):
+            self.assertIs(c.optimize(), c)
+
+        c = to_criteria("make == 'Acura' and make == 'Acura'", compiled=True)
+        self.assertEqual(c.optimize(), Eq("make", "Acura").compile())
+
+    def test_random_trees(self):
+        rnd = random.Random(11)
+        objs = [random_obj(rnd) for _ in range(40)]
+        (before, after) = (0, 0)
+
+        for _ in range(500):
+            c = random_criteria(rnd, 4)
+            o = c.optimize()
+            self.assertSameOutcomes(c, o, objs)
+            (before, after) = (before + nodes(c), after + nodes(o))
+
+        self.assertLess(after, before)
+
+
+if __name__ == '__main__':
+    unittest.main()
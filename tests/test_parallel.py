@@ -0,0 +1,72 @@
+import pickle
+import operator
+import unittest
+from unittest import TestCase
+from beval.criteria import Const, to_criteria, All, Eq, In, Between, universal
+from beval.parallel import payload_of
+from test_helper import CARS
+
+
+DICTS = [car.toDict() for car in CARS]
+
+
+class PairError(Exception):
+
+    def __init__(self, left, right):
+        super(PairError, self).__init__("%s %s" % (left, right))
+
+
+class Broken(object):
+
+    def __eq__(self, other):
+        raise PairError(other, "broken")
+
+
+class TestParallel(TestCase):
+
+    def test_same_as_filter(self):
+        for expr in ("make == 'Acura' and drivetrain == 'Front'", "make in ('Ford','Acura',) or mpgcity > 25",
+                     "cpu == 'Intel' or type == 'Small'", "17 <= maxprice < 21"):
+            c = to_criteria(expr)
+            for fuzzy in (False, True,):
+                for on_error in (Const.exclude, Const.include,):
+                    expected = list(c.filter(DICTS, fuzzy, on_error))
+                    self.assertEqual(list(c.filter_parallel(DICTS, 2, 7, fuzzy, on_error)), expected)
+                    self.assertEqual(list(c.compile().filter_parallel(DICTS, 2, 50, fuzzy, on_error)), expected)
+
+                    unordered = list(c.filter_parallel(DICTS, 2, 7, fuzzy, on_error, ordered=False))
+                    self.assertEqual(sorted(id(one) for one in unordered), sorted(id(one) for one in expected))
+
+    def test_raise(self):
+        c = to_criteria("make == 'Acura' or cpu == 'Intel'")
+        matched = list()
+        with self.assertRaises(KeyError):
+            for obj in c.filter_parallel(DICTS[2:] + DICTS[:2], 2, 10, on_error=Const.raise_):
+                matched.append(obj)
+
+        self.assertEqual(matched, [])
+
+        objs = DICTS[:2] + [{"make": "Ford"}] + DICTS
+        with self.assertRaises(KeyError):
+            for obj in c.filter_parallel(objs, 2, 2, on_error=Const.raise_):
+                matched.append(obj)
+
+        self.assertEqual(matched, DICTS[:2])
+
+        for ordered in (True, False,):
+            with self.assertRaises(RuntimeError):
+                list(c.filter_parallel([{"make": Broken()}], 2, 10, on_error=Const.raise_, ordered=ordered))
+
+    def test_payload(self):
+        self.assertEqual(payload_of(to_criteria("make == 'Acura'")), ("make == 'Acura'", None))
+        self.assertEqual(payload_of(In("make", universal)), ("make in ('*',)", None))
+
+        c = All(Eq("make", "Acura"), Between(10, "maxprice", 20, upper_op=operator.ge))
+        (expr, pickled) = payload_of(c)
+        self.assertIsNone(expr)
+        self.assertEqual(pickle.loads(pickled), c)
+        self.assertEqual(list(c.filter_parallel(DICTS, 2, 7)), list(c.filter(DICTS)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from unittest import TestCase
+from beval.criteria import Profile, Const, Eq, criteria_class, to_criteria, set_mode
+from test_helper import CARS, CAR_DF
+
+
+class TestProfile(TestCase):
+
+    def test_profile(self):
+        expr = "make == 'Acura' and (type == 'Small' or cpu == 'Intel')"
+        with Profile() as profile:
+            c = to_criteria(expr)
+            self.assertIsInstance(c.many[0], Eq)
+            self.assertIsNot(type(c.many[0]), Eq)
+
+            for car in CARS:
+                c(car)
+
+            c({"make": "Acura", "type": "Midsize"}, fuzzy=True)
+
+        self.assertIs(criteria_class.lookup(Const.Eq), Eq)
+        self.assertIs(type(to_criteria(expr).many[0]), Eq)
+
+        report = profile.report()
+        self.assertEqual(report["make == 'Acura'"]["calls"], len(CARS) + 1)
+        self.assertEqual(report["make == 'Acura'"]["true"], 3)
+        self.assertEqual(report["make == 'Acura'"]["false"], len(CARS) - 2)
+
+        small = report["type == 'Small'"]
+        self.assertEqual(small["calls"], 3)
+        self.assertEqual(small["true"] + small["false"], 3)
+        self.assertGreater(small["seconds"], 0)
+
+        cpu = report["cpu == 'Intel'"]
+        self.assertEqual(cpu["calls"], small["false"])
+        self.assertEqual(cpu["exceptions"], cpu["calls"])
+        self.assertEqual(cpu["unknown"], 1)
+        self.assertEqual(cpu["error"], cpu["calls"] - 1)
+
+        root = report[str(c)]
+        self.assertEqual(root["calls"], len(CARS) + 1)
+        self.assertGreaterEqual(root["seconds"], report["make == 'Acura'"]["seconds"])
+        self.assertEqual(sorted(root.keys()), sorted(Profile.names))
+
+        profile.reset()
+        self.assertEqual(profile.report(), {})
+
+    def test_compiled_paths(self):
+        with Profile() as profile:
+            c = to_criteria("make == 'Acura' and type == 'Small'")
+
+        columns = dict((col.lower(), CAR_DF[col]) for col in CAR_DF.columns)
+        acura = len(list(Eq("make", "Acura").filter(CARS)))
+        for run in (lambda: list(c.filter(CARS)), lambda: [c.compile()(car) for car in CARS],
+                    lambda: [c.evaluator()(car) for car in CARS], lambda: [c.adaptive()(car) for car in CARS],
+                    lambda: c.vectorize(columns)):
+            profile.reset()
+            run()
+            self.assertEqual(profile.report()[str(c)]["calls"], len(CARS))
+            self.assertEqual(profile.report()["make == 'Acura'"]["calls"], len(CARS))
+            self.assertEqual(profile.report()["type == 'Small'"]["calls"], acura)
+
+    def test_production_mode(self):
+        with Profile() as profile:
+            c = to_criteria("make == 'Acura' and type == 'Small'")
+
+        try:
+            set_mode(Const.production)
+            for car in CARS:
+                c(car)
+
+        finally:
+            set_mode(Const.debug)
+
+        self.assertEqual(profile.report()[str(c)]["calls"], len(CARS))
+        self.assertEqual(profile.report()["make == 'Acura'"]["calls"], len(CARS))
+
+
+if __name__ == '__main__':
+    unittest.main()
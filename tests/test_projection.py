@@ -0,0 +1,56 @@
+import csv
+import json
+import unittest
+from unittest import TestCase
+from StringIO import StringIO
+from beval.criteria import Projection, to_criteria, Eq, All, Any, Not
+from test_helper import CAR_DATA, CARS
+from test_rule_index import EXPRESSIONS
+
+
+class TestProjection(TestCase):
+
+    def test_required_keys(self):
+        self.assertEqual(to_criteria("make == 'Acura'").required_keys(), frozenset(["make"]))
+        self.assertEqual(to_criteria("17 <= maxprice < 21 and (type in ('Small',) or not (cpu == 'Intel'))").required_keys(),
+                         frozenset(["maxprice", "type", "cpu"]))
+        self.assertEqual(to_criteria("True and 2 in (1,2,) and make").required_keys(), frozenset([True, 2, "make"]))
+        self.assertEqual(to_criteria("make == 'Acura' or mpgcity > 25").compile().required_keys(), frozenset(["make", "mpgcity"]))
+        self.assertEqual(to_criteria("make == 'Acura'").adaptive().required_keys(), frozenset(["make"]))
+        self.assertEqual(All().required_keys(), frozenset())
+        self.assertEqual(Not(Any(Eq("a", 1), Eq("b", 1))).required_keys(), frozenset(["a", "b"]))
+
+    def test_project_objects(self):
+        rules = [to_criteria(expr) for expr in EXPRESSIONS]
+        projection = Projection(*rules)
+        self.assertEqual(projection.keys, frozenset(["make", "mpgcity", "maxprice", "type", "cpu", True, "True"]))
+
+        for car in CARS:
+            projected = projection(car)
+            self.assertEqual(sorted(projected), ["make", "maxprice", "mpgcity", "type"])
+            for fuzzy in (False, True,):
+                self.assertEqual([rule(projected, fuzzy)[0] for rule in rules], [rule(car, fuzzy)[0] for rule in rules])
+
+    def test_project_rows(self):
+        criteria = to_criteria("make == 'Acura' and type == 'Small' and source == 'nonUSA'")
+        projection = Projection(criteria)
+        reader = csv.reader(StringIO(CAR_DATA))
+        project = projection.row([name.lower() for name in next(reader)])
+
+        rows = [project(row) for row in reader]
+        self.assertEqual(rows[0], {"make": "Acura", "type": "Small", "source": "nonUSA"})
+        self.assertEqual(len([row for row in rows if criteria(row)[0] is True]), 1)
+
+        project = Projection(to_criteria("a > 1 and c == 2")).row(["a", "b", "c"], convert=int)
+        self.assertEqual(project(["2", "x", "3"]), {"a": 2, "c": 3})
+        self.assertEqual(project(["2"]), {"a": 2})
+
+    def test_project_json(self):
+        projection = Projection(to_criteria("make == 'Acura' and mpgcity > 20"))
+        self.assertEqual(projection.json(json.dumps({"make": "Acura", "mpgcity": 25, "type": "Small"})),
+                         {"make": "Acura", "mpgcity": 25})
+        self.assertEqual(projection.json("[1, 2]"), [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
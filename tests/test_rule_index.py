@@ -0,0 +1,131 @@
+import random
+import operator
+import unittest
+from unittest import TestCase
+from beval.criteria import RuleIndex, SyntaxAstCallExtender, to_criteria, Eq, In, Between, Any
+from test_helper import acura_small as acura, CompareError, CARS
+
+
+EXPRESSIONS = (
+    "make == 'Acura'",
+    "make != 'Acura'",
+    "mpgcity > 25",
+    "mpgcity >= 25 and maxprice < 20",
+    "17 <= maxprice < 21 and make == 'Chevrolet' and type == 'Compact'",
+    "(17 <= maxprice < 21 and make == 'Chevrolet') or type == 'Compact'",
+    "make in ('Ford','Chrysler','Eagle','Honda','Acura','Mazda',)",
+    "make not in ('Ford','Chrysler','Eagle',)",
+    "not (make == 'Acura' or type == 'Small')",
+    "cpu == 'Intel' and make == 'Acura' and type == 'Small'",
+    "cpu == 'Intel' or make == 'Acura' or type == 'Small'",
+    "make == 'Acura' and cpu == 'Intel'",
+    "21 > maxprice >= 17",
+    "15 < mpgcity <= 25 and type in ('Small','Compact',)",
+    "make in ('*',) and type == 'Small'",
+    "make < 10",
+    "make",
+    "True",
+    "'True' == True",
+    "1 in (4,3,2,1,0,)",
+)
+
+
+def random_rules(count, seed=7):
+    rnd = random.Random(seed)
+    (makes, types) = (sorted(set(car.make for car in CARS)), sorted(set(car.type for car in CARS)))
+    rules = list()
+
+    for _ in range(count):
+        low = rnd.randint(5, 40)
+        conditions = [
+            "make == '%s'" % rnd.choice(makes),
+            "type in (%s,)" % ",".join("'%s'" % one for one in rnd.sample(types, 2)),
+            "%s <= maxprice < %s" % (low, low + rnd.randint(1, 10)),
+            "mpgcity > %s" % rnd.randint(15, 35),
+            "cpu == 'Intel'",
+            "source != 'USA'",
+        ]
+        expr = " and ".join(rnd.sample(conditions, rnd.randint(1, 3)))
+        rules.append(to_criteria(expr if rnd.random() < 0.8 else "%s or %s" % (expr, rnd.choice(conditions))))
+
+    return rules
+
+
+class TestRuleIndex(TestCase):
+
+    def assertSameAsRules(self, index, rules, objs):
+        for fuzzy in (False, True,):
+            for obj in objs:
+                expected = [rule for rule in rules if rule(obj, fuzzy)[0] is True]
+                self.assertEqual(index.match(obj, fuzzy), expected)
+
+    def test_match(self):
+        (rules, cars) = ([to_criteria(expr) for expr in EXPRESSIONS], [car.toDict() for car in CARS])
+        index = RuleIndex(rules)
+        self.assertEqual(len(index), len(rules))
+        self.assertEqual(index.rules, rules)
+        self.assertSameAsRules(index, rules, CARS)
+        self.assertSameAsRules(index, rules, cars)
+        self.assertSameAsRules(index, rules, [{}, {"make": "Acura"}, {"make": None, "maxprice": float("nan")}])
+
+    def test_match_random_rules(self):
+        rules = random_rules(500)
+        index = RuleIndex(rules)
+        self.assertSameAsRules(index, rules, CARS)
+
+        candidates = sum(len(index.candidates(car)) for car in CARS)
+        self.assertLess(candidates, len(rules) * len(CARS) / 4)
+
+    def test_compiled_and_added(self):
+        index = RuleIndex()
+        rules = [to_criteria(expr, compiled=True) for expr in EXPRESSIONS]
+        for position, rule in enumerate(rules):
+            self.assertEqual(index.add(rule), position)
+
+        self.assertSameAsRules(index, rules, CARS)
+
+        with self.assertRaises(TypeError):
+            index.add("make == 'Acura'")
+
+    def test_ranges(self):
+        rules = [Between(3, "x", 5), Between(3, "x", 5, upper_op=operator.le),
+                 to_criteria("x > 3"), to_criteria("x >= 3"), to_criteria("x < 5"), to_criteria("x <= 5"),
+                 to_criteria("5 > x > 3"), to_criteria("x == 4.0"), In("x", 3, 4, 5), Eq("x", True)]
+        objs = [{"x": x} for x in (1, 2, 3, 3.5, 4, 5, 6, True, "4", None, float("nan"), 10 ** 20)]
+        self.assertSameAsRules(RuleIndex(rules), rules, objs)
+
+    def test_unorderable_and_errors(self):
+        rules = [to_criteria(expr) for expr in EXPRESSIONS] + [Any(), In("make")]
+        index = RuleIndex(rules)
+        with acura:
+            acura.set_compare_error("make", CompareError(Exception("left first")))
+            acura.set_access_error("maxprice", KeyError)
+            self.assertSameAsRules(index, rules, [acura])
+
+    def test_comparator_registered_after_index(self):
+        class Upper(SyntaxAstCallExtender):
+
+            def name(self):
+                return "Upper"
+
+            def type(self):
+                return str
+
+            def compare(self, ctx, key, op, left, right):
+                return op(left.upper(), right.upper())
+
+        (rules, extender) = ([to_criteria("make == 'acura'"), to_criteria("make in ('FORD','acura',)")], Upper())
+        index = RuleIndex(rules)
+
+        try:
+            SyntaxAstCallExtender.register(extender)
+            self.assertEqual(index.match({"make": "Acura"}), rules)
+
+        finally:
+            SyntaxAstCallExtender.unregister(extender)
+
+        self.assertEqual(index.match({"make": "Acura"}), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from unittest import TestCase
+from beval.criteria import RuleNetwork, Const, Ctx, criteria_class, to_criteria, Eq, All, Any, Not, cTrue
+from test_helper import acura_small as acura, CompareError, CARS
+from test_rule_index import EXPRESSIONS, random_rules
+
+
+class CountingCtx(Ctx):
+
+    __slots__ = ()
+
+    lookups = list()
+
+    def lookup(self, key):
+        CountingCtx.lookups.append(key)
+        return super(CountingCtx, self).lookup(key)
+
+
+class TestRuleNetwork(TestCase):
+
+    def assertSameAsRules(self, network, rules, objs):
+        for fuzzy in (False, True,):
+            for obj in objs:
+                outcomes = network.evaluate(obj, fuzzy)
+                self.assertEqual(len(outcomes), len(rules))
+
+                for (rule, (ans, err)) in zip(rules, outcomes):
+                    (ans_, err_) = rule(obj, fuzzy)
+                    self.assertEqual(ans, ans_)
+                    self.assertEqual(type(err), type(err_))
+
+                self.assertEqual(network.match(obj, fuzzy), [rule for rule in rules if rule(obj, fuzzy)[0] is True])
+
+    def test_same_as_rules(self):
+        rules = [to_criteria(expr) for expr in EXPRESSIONS]
+        network = RuleNetwork(rules)
+        self.assertEqual(len(network), len(rules))
+        self.assertEqual(network.rules, rules)
+        self.assertSameAsRules(network, rules, CARS)
+        self.assertSameAsRules(network, rules, [{}, {"make": "Acura"}, {"make": None, "maxprice": float("nan")}])
+
+        rules = random_rules(300)
+        self.assertSameAsRules(RuleNetwork(rules), rules, CARS)
+
+    def test_first_error(self):
+        rules = [to_criteria(expr) for expr in EXPRESSIONS] + [All(), Any(), Not(Any())]
+        network = RuleNetwork(rules)
+        with acura:
+            acura.set_compare_error("make", CompareError(Exception("left first")))
+            acura.set_access_error("maxprice", KeyError)
+            self.assertSameAsRules(network, rules, [acura])
+
+    def test_shared_nodes(self):
+        rules = [
+            to_criteria("make == 'Acura' and 28 <= mpgcity < 32"),
+            to_criteria("(make == 'Acura' and 28 <= mpgcity < 32) or type == 'Small'"),
+            to_criteria("not (make == 'Acura') and type == 'Small'", compiled=True),
+            All(Eq("make", "Acura"), cTrue),
+            Eq("make", True),
+            Eq("make", 1),
+        ]
+        network = RuleNetwork(rules)
+        self.assertEqual(network.size, 11)
+
+        criteria_class.override(Const.Ctx, CountingCtx)
+        try:
+            del CountingCtx.lookups[:]
+            network.evaluate({"make": "Acura", "mpgcity": 30, "type": "Small"})
+            self.assertEqual(sorted(CountingCtx.lookups, key=str), [True, "make", "make", "make", "mpgcity"])
+
+        finally:
+            criteria_class.override(Const.Ctx, Ctx)
+
+    def test_add(self):
+        network = RuleNetwork()
+        self.assertEqual(network.add(to_criteria("make == 'Acura'")), 0)
+        self.assertEqual(network.add(to_criteria("make == 'Acura'")), 1)
+        self.assertEqual(network.size, 1)
+
+        with self.assertRaises(TypeError):
+            network.add("make == 'Acura'")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import csv
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import TestCase
+from StringIO import StringIO
+from beval.criteria import Const, to_criteria, csv_value
+from beval.__main__ import main
+from test_helper import CAR_DATA, CARS
+
+
+CSV_DATA = CAR_DATA.replace("Make,Type,MinPrice,MidPrice,MaxPrice", "make,type,minprice,midprice,maxprice")
+
+
+class TestStream(TestCase):
+
+    def test_filter_csv(self):
+        criteria = to_criteria("make in ('Acura','Ford',) and 7 <= maxprice < 21")
+        expected = [[car.make, car.type] for car in CARS if criteria(car)[0] is True]
+        for chunksize in (1, 7, 1024,):
+            (source, sink) = (StringIO(CSV_DATA), StringIO())
+            self.assertEqual(criteria.filter_csv(source, sink, buffersize=100, chunksize=chunksize), len(expected))
+
+            rows = list(csv.reader(StringIO(sink.getvalue())))
+            self.assertEqual(rows[0], CSV_DATA.splitlines()[0].split(","))
+            self.assertEqual([row[:2] for row in rows[1:]], expected)
+
+    def test_filter_csv_errors(self):
+        criteria = to_criteria("cpu == 'Intel' or make == 'Acura'")
+        self.assertEqual(criteria.filter_csv(StringIO(CSV_DATA), StringIO()), 0)
+        self.assertEqual(criteria.filter_csv(StringIO(CSV_DATA), StringIO(), fuzzy=True), 2)
+        self.assertEqual(criteria.filter_csv(StringIO(CSV_DATA), StringIO(), on_error=Const.include), len(CARS))
+
+        with self.assertRaises(KeyError):
+            criteria.filter_csv(StringIO(CSV_DATA), StringIO(), on_error=Const.raise_)
+
+        (source, sink) = (StringIO("make,cpu\nAcura,\nFord,\nAcura\nAcura,\n"), StringIO())
+        with self.assertRaises(KeyError):
+            to_criteria("make == 'Acura' and cpu == ''").filter_csv(source, sink, on_error=Const.raise_)
+        self.assertEqual(sink.getvalue().splitlines(), ["make,cpu", "Acura,"])
+
+        self.assertEqual(criteria.filter_csv(StringIO(""), StringIO()), 0)
+
+    def test_csv_value(self):
+        self.assertEqual([csv_value(text) for text in ("12", "-1.5", "Acura", "", "NA", "1.2.3", "nan")],
+                         [12, -1.5, "Acura", "", "NA", "1.2.3", "nan"])
+        self.assertEqual([csv_value(text) for text in ("02134", "007", "+1", "-0", "00.5", "-inf", "1_000", "-")],
+                         ["02134", "007", "+1", "-0", "00.5", "-inf", "1_000", "-"])
+        self.assertEqual([csv_value(text) for text in ("0", "-12", "0.5", ".5", "1.50", "1e3")], [0, -12, 0.5, 0.5, 1.5, 1000.0])
+
+    def test_filter_csv_codes(self):
+        (source, sink) = (StringIO("zip,city\n02134,Boston\n2134,Nowhere\n"), StringIO())
+        self.assertEqual(to_criteria("zip == '02134'").filter_csv(source, sink), 1)
+        self.assertEqual(sink.getvalue().splitlines()[1:], ["02134,Boston"])
+
+    def test_filter_jsonl(self):
+        records = [{"make": "Acura", "type": "Small", "other": [1, {"x": 2}]}, {"make": "Ford"}, {"type": "Small"}]
+        text = "\n".join(json.dumps(record) for record in records) + "\n\n"
+
+        sink = StringIO()
+        self.assertEqual(to_criteria("make == 'Acura' or type == 'Small'").filter_jsonl(StringIO(text), sink, fuzzy=True), 2)
+        self.assertEqual([json.loads(line) for line in sink.getvalue().splitlines()], [records[0], records[2]])
+
+    def test_filter_jsonl_errors(self):
+        lines = ['{"make": "Acura"}\n', '{"make": \n', '{"make": "Ford"}\n', '{"make": "Acura", "type": "Small"}\n']
+        criteria = to_criteria("make == 'Acura'")
+        for fuzzy in (False, True,):
+            for (on_error, expected) in ((Const.exclude, [0, 3]), (Const.include, [0, 1, 3])):
+                sink = StringIO()
+                self.assertEqual(criteria.filter_jsonl(StringIO("".join(lines)), sink, fuzzy, on_error), len(expected))
+                self.assertEqual(sink.getvalue(), "".join(lines[i] for i in expected))
+
+        sink = StringIO()
+        with self.assertRaises(ValueError):
+            criteria.filter_jsonl(StringIO("".join(lines)), sink, on_error=Const.raise_)
+        self.assertEqual(sink.getvalue(), lines[0])
+
+    def test_main(self):
+        folder = tempfile.mkdtemp()
+        try:
+            (source, sink) = (os.path.join(folder, "cars.csv"), os.path.join(folder, "matched.csv"))
+            with open(source, "w") as stream:
+                stream.write(CSV_DATA)
+
+            main(["make == 'Acura'", "--input", source, "--output", sink])
+            with open(sink) as stream:
+                self.assertEqual([row[:2] for row in csv.reader(stream)][1:], [["Acura", "Small"], ["Acura", "Midsize"]])
+
+        finally:
+            shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+import warnings
+import numpy as np
+from unittest import TestCase
+from beval.criteria import Criteria, Const, Masks, to_criteria, All, Any, Eq, In, SyntaxAstCallExtender
+from beval.parallel import SharedColumns
+from test_helper import CAR_DF, CARS
+
+
+EXPRESSIONS = (
+    "make == 'Acura'",
+    "make != 'Acura'",
+    "mpgcity > 25",
+    "rearseat >= 27",
+    "mpgcity >= 25 and maxprice < 20",
+    "17 <= maxprice < 21 and make == 'Chevrolet' and type == 'Compact'",
+    "(17 <= maxprice < 21 and make == 'Chevrolet') or type == 'Compact'",
+    "make in ('Ford','Chrysler','Eagle','Honda','Acura','Mazda',)",
+    "make not in ('Ford','Chrysler','Eagle',)",
+    "not (make == 'Acura' or type == 'Small')",
+    "cpu == 'Intel' and make == 'Acura' and type == 'Small'",
+    "make == 'Acura' and cpu == 'Intel'",
+    "cpu == 'Intel' or make == 'Acura' or type == 'Small'",
+    "make == 'Acura' or cpu == 'Intel'",
+    "cpu in ('Intel','AMD',) or not (gpu == 'Nvidia')",
+    "manual",
+    "manual and not airbags",
+    "make < 10",
+    "True",
+    "'True' == True",
+    "1 in (4,3,2,1,0,)",
+    "make in ('*',)",
+)
+
+
+COLUMNS = {col.lower(): CAR_DF[col] for col in CAR_DF.columns}
+
+
+class TestVectorize(TestCase):
+
+    def assertSameAsRows(self, criteria, columns, objs):
+        for fuzzy in (False, True,):
+            masks = criteria.vectorize(columns, fuzzy)
+            self.assertIsInstance(masks, Masks)
+
+            expected = [criteria(obj, fuzzy)[0] for obj in objs]
+            self.assertEqual(list(masks.true), [ans is True for ans in expected])
+            self.assertEqual(list(masks.false), [ans is False for ans in expected])
+            self.assertEqual(list(masks.unknown), [ans == Const.UNKNOWN for ans in expected])
+            self.assertEqual(list(masks.error), [ans == Const.ERROR for ans in expected])
+
+    def test_vectorize_dict_of_arrays(self):
+        columns = {
+            "make": np.array(["Subaru", "Acura", "Ford"]),
+            "mpgcity": np.array([30, 25, 22]),
+        }
+        masks = to_criteria("make == 'Acura' or 28 <= mpgcity < 32").vectorize(columns)
+        self.assertEqual(list(masks.true), [True, True, False])
+        self.assertEqual(list(masks.false), [False, False, True])
+        self.assertFalse(masks.unknown.any())
+        self.assertFalse(masks.error.any())
+
+        masks = to_criteria("cpu == 'Intel' and make == 'Acura'").vectorize(columns, fuzzy=True)
+        self.assertEqual(list(masks.true), [False, True, False])
+        self.assertEqual(list(masks.false), [True, False, True])
+        self.assertFalse(masks.error.any())
+
+    def test_same_as_rows(self):
+        for expr in EXPRESSIONS:
+            criteria = to_criteria(expr)
+            self.assertSameAsRows(criteria, COLUMNS, CARS)
+            self.assertSameAsRows(criteria.compile(), COLUMNS, CARS)
+
+    def test_same_as_rows_dataframe(self):
+        df = CAR_DF.rename(columns=str.lower)
+        for expr in EXPRESSIONS:
+            self.assertSameAsRows(to_criteria(expr), df, CARS)
+
+    def test_same_as_rows_mixed_objects(self):
+        values = [1, "1", None, True, "true", 0.0, "x", float("nan")]
+        columns = {"x": np.array(values, dtype=object)}
+        objs = [{"x": value} for value in values]
+        for expr in ("x", "x == 1", "x in (1,'x',)", "0 <= x < 2", "not x"):
+            self.assertSameAsRows(to_criteria(expr), columns, objs)
+
+    def test_same_as_rows_mixed_types(self):
+        columns = {"x": np.array([1, 2, 5]), "y": np.array(["b", "c", "d"]), "z": np.array([True, False, True])}
+        objs = [dict(zip(columns, row)) for row in zip(*[columns[key].tolist() for key in columns])]
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            for expr in ("x == 'a'", "x != 'a'", "x in (1,'b',)", "y == 1", "y not in (1,'c',)", "'a' <= y < 'c'",
+                         "1 <= x < 'c'", "z == 1", "z"):
+                self.assertSameAsRows(to_criteria(expr), columns, objs)
+
+    def test_empty_many(self):
+        columns = {"make": np.array(["Acura"])}
+        for criteria in (All(), Any()):
+            masks = criteria.vectorize(columns)
+            self.assertTrue(masks.error.all())
+
+    def test_generic_fallback(self):
+        class Odd(Criteria):
+
+            def __init__(self):
+                super(Odd, self).__init__()
+
+            def eval(self, ctx):
+                return ctx["mpgcity"] % 2 == 1, None
+
+        self.assertSameAsRows(All(Odd(), Eq("make", "Ford")), COLUMNS, CARS)
+
+    def test_parallel_same_as_vectorize(self):
+        shared = SharedColumns(COLUMNS)
+        for expr in EXPRESSIONS[::3]:
+            criteria = to_criteria(expr)
+            for fuzzy in (False, True,):
+                expected = criteria.vectorize(COLUMNS, fuzzy)
+                for columns in (COLUMNS, shared,):
+                    masks = criteria.vectorize_parallel(columns, fuzzy, workers=2, chunksize=10)
+                    self.assertIsInstance(masks, Masks)
+                    for (mask, mask_) in zip(masks, expected):
+                        self.assertEqual(list(mask), list(mask_))
+
+    def test_shared_columns(self):
+        values = [1, "1", None, True, "true", 0.0, "x", float("nan")]
+        columns = {"make": np.array(["Subaru", "Acura", "Ford"] * 3, dtype=object), "x": np.array(values + [2], dtype=object),
+                   "mpgcity": np.arange(9)}
+        shared = SharedColumns(columns)
+        self.assertEqual(shared.size, 9)
+        self.assertEqual(sorted(shared.keys()), ["make", "mpgcity", "x"])
+        self.assertIn("make", shared)
+        self.assertEqual(shared["make"].dtype.kind, "S" if str is bytes else "U")
+        self.assertEqual(shared["x"].dtype, object)
+        self.assertEqual(list(shared["mpgcity"]), list(range(9)))
+
+        for expr in ("make == 'Acura' or x in (1,'x',)", "0 <= x < 2 and mpgcity > 3", "not x", "make"):
+            criteria = to_criteria(expr)
+            for fuzzy in (False, True,):
+                self.assertEqual([list(mask) for mask in criteria.vectorize_parallel(shared, fuzzy, workers=3, chunksize=2)],
+                                 [list(mask) for mask in criteria.vectorize(columns, fuzzy)])
+
+        masks = to_criteria("make == 'Acura'").vectorize_parallel({"make": np.array([])})
+        self.assertEqual(len(masks.true), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
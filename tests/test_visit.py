@@ -70,6 +70,28 @@ class TestVisit(TestCase):
         self.assertTrue(ans)
         self.assertIsNone(err)
 
+    def test_literal_keys_looked_up_first(self):
+        for (c, obj, ans_) in ((to_criteria("'2019' == 5"), {"2019": 5}, True),
+                               (Criteria().Eq(1, "one").Done(), {1: "one"}, True),
+                               (to_criteria("True"), {True: False}, False),
+                               (to_criteria("'True' == True"), {"True": "no"}, False),
+                               (to_criteria("0 <= 1 < 2"), {1: 5}, False),
+                               (to_criteria("1 in (4,3,2,1,0,)"), {1: 7}, False)):
+            for fuzzy in (True, False):
+                for criteria in (c, c.compile(), c.optimize()):
+                    (ans, err) = criteria(obj, fuzzy)
+                    self.assertEqual(ans, ans_)
+                    self.assertIsNone(err)
+
+        for (text, ans_) in (("True", True), ("'True' == True", True), ("1 in (4,3,2,1,0,)", True),
+                             ("0 <= 1 < 2", True), ("'False'", False), ("-1 == '-1'", False)):
+            c = to_criteria(text)
+            for fuzzy in (True, False):
+                for criteria in (c, c.compile()):
+                    (ans, err) = criteria({"make": "Acura"}, fuzzy)
+                    self.assertEqual(ans, ans_)
+                    self.assertIsNone(err)
+
     def test_simple_bool_eq(self):
         ctx = Ctx({"active": True})
 
@@ -383,7 +405,9 @@ class TestVisit(TestCase):
                         return True
                 return False
 
-        SyntaxAstCallExtender.register(GroupAstCallExtender())
+        extender = GroupAstCallExtender()
+        SyntaxAstCallExtender.register(extender)
+        self.addCleanup(SyntaxAstCallExtender.unregister, extender)
 
         expected = "source in (group('foreign',category='default',namespace='official'),)"
         in_ = to_criteria(expected)